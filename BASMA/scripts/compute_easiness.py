@@ -3,25 +3,61 @@
 import csv
 import json
 import argparse
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    # Faster JSON decoding when available; both accept bytes
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
 
 # Default config path
 DEFAULT_CONFIG = Path(__file__).parent / 'config.json'
 
+# Integer codes for packing a 5-factor level combination into one index
+SIM_CODES = {'S': 0, 'D': 1}
+LMH_CODES = {'L': 0, 'M': 1, 'H': 2}
+N_COMBOS = 2 * 2 * 3 * 3 * 3
+# Scores columns read by main (missing ones read as empty)
+SCORES_COLUMNS = ['ASim', 'FSim', 'DFreq', 'DCom', 'English', 'French', 'MSA', 'POS', 'CODA']
+# Level names by code; code -1 (missing) picks the trailing ''
+SIM_NAMES = np.array(['S', 'D'])
+LMH_NAMES = np.array(['L', 'M', 'H', ''])
+
+# Read buffer for CSV inputs (1MB) to cut down on read() syscalls
+READ_BUFFER_SIZE = 1 << 20
+# Output is written through a 1MB buffer in batches of rows
+WRITE_BUFFER_SIZE = 1 << 20
+WRITE_BATCH_ROWS = 4096
+
 
 def load_config(config_path: Path) -> dict:
     """Load configuration from JSON file."""
     if not config_path.exists():
         raise FileNotFoundError(f"Config file not found: {config_path}")
     
-    with config_path.open('r') as f:
-        return json.load(f)
+    with config_path.open('rb') as f:
+        return _json_loads(f.read())
+
 
+def encode_combo(asim, fsim, dfreq, dcom, rcom):
+    """Pack level codes (SIM_CODES / LMH_CODES) into a single index in [0, N_COMBOS)."""
+    return (((asim * 2 + fsim) * 3 + dfreq) * 3 + dcom) * 3 + rcom
 
-def parse_temp_scoring(temp_csv: Path, config: dict) -> Dict[Tuple[str, str, str, str, str], Tuple[int, str]]:
-    """Parse Temp CSV to extract (ASim, FSim, DFreq, DCom, RCom) -> (Score, Category) mappings."""
-    combo_to_score = {}
+
+def parse_temp_scoring(temp_csv: Path, config: dict) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parse Temp CSV to extract (ASim, FSim, DFreq, DCom, RCom) -> (Score, Category) mappings.
+    Returns (score_arr, cat_arr) of length N_COMBOS indexed by encode_combo: int32 scores
+    and object categories, with category '' where the combination is undefined.
+    """
+    score_arr = np.zeros(N_COMBOS, dtype=np.int32)
+    cat_arr = np.full(N_COMBOS, '', dtype=object)
     
     if not temp_csv.exists():
         raise SystemExit(f"Temp file not found: {temp_csv}")
@@ -32,35 +68,33 @@ def parse_temp_scoring(temp_csv: Path, config: dict) -> Dict[Tuple[str, str, str
     cols = scoring_cfg['columns']
     thresholds = config['category_thresholds']
     
-    with temp_csv.open('r', newline='', encoding='utf-8') as f:
+    with temp_csv.open('r', buffering=READ_BUFFER_SIZE, newline='', encoding='utf-8') as f:
         reader = csv.reader(f)
         rows = list(reader)
         
         if len(rows) < data_start:
             raise SystemExit(f"Temp file doesn't have expected structure (need at least {data_start} rows)")
         
+        # Fetch the seven scoring fields in one call per row; rows too short
+        # to hold every configured column are skipped below
+        fields = itemgetter(
+            cols['asim'], cols['fsim'], cols['dfreq'], cols['dcom'], cols['rcom'],
+            cols['score'], cols['category'],
+        )
+        min_len = max(cols.values()) + 1
+        strip = str.strip
+        
         # Data starts at data_start (index data_start-1)
-        for i in range(data_start - 1, len(rows)):
-            row = rows[i]
-            if len(row) < max(cols.values()) + 1:
+        for row in rows[data_start - 1:]:
+            if len(row) < min_len:
                 continue
             
-            asim = row[cols['asim']].strip() if len(row) > cols['asim'] else ''
-            fsim = row[cols['fsim']].strip() if len(row) > cols['fsim'] else ''
-            dfreq = row[cols['dfreq']].strip() if len(row) > cols['dfreq'] else ''
-            dcom = row[cols['dcom']].strip() if len(row) > cols['dcom'] else ''
-            rcom = row[cols['rcom']].strip() if len(row) > cols['rcom'] else ''
-            score_str = row[cols['score']].strip() if len(row) > cols['score'] else ''
-            category = row[cols['category']].strip() if len(row) > cols['category'] else ''
-            
-            # Skip empty rows
-            if not asim or not fsim or not dfreq or not dcom or not rcom:
-                continue
+            asim, fsim, dfreq, dcom, rcom, score_str, category = map(strip, fields(row))
             
-            # Validate levels
-            if asim not in ('S', 'D') or fsim not in ('S', 'D'):
+            # Validate levels (empty cells fail these too)
+            if asim not in SIM_CODES or fsim not in SIM_CODES:
                 continue
-            if dfreq not in ('L', 'M', 'H') or dcom not in ('L', 'M', 'H') or rcom not in ('L', 'M', 'H'):
+            if dfreq not in LMH_CODES or dcom not in LMH_CODES or rcom not in LMH_CODES:
                 continue
             
             try:
@@ -68,10 +102,11 @@ def parse_temp_scoring(temp_csv: Path, config: dict) -> Dict[Tuple[str, str, str
             except ValueError:
                 continue
             
-            key = (asim, fsim, dfreq, dcom, rcom)
-            if category:
-                combo_to_score[key] = (score, category)
-            else:
+            key = encode_combo(
+                SIM_CODES[asim], SIM_CODES[fsim],
+                LMH_CODES[dfreq], LMH_CODES[dcom], LMH_CODES[rcom]
+            )
+            if not category:
                 # If no category specified, infer from score ranges using config thresholds
                 if score >= thresholds['easy_min']:
                     category = 'Easy'
@@ -79,108 +114,101 @@ def parse_temp_scoring(temp_csv: Path, config: dict) -> Dict[Tuple[str, str, str
                     category = 'Medium'
                 else:
                     category = 'Hard'
-                combo_to_score[key] = (score, category)
+            score_arr[key] = score
+            cat_arr[key] = category
     
-    return combo_to_score
+    return score_arr, cat_arr
 
 
-def map_asim(asim_raw: str) -> str:
-    try:
-        return 'S' if int(asim_raw) == 1 else 'D'
-    except Exception:
-        return 'D' if (asim_raw or '').strip() not in ('1', 'S') else 'S'
+# Stripped ASim/FSim values seen in practice; anything else goes through _parse_sim
+_SIM_CODE_BY_VALUE = {
+    '1': SIM_CODES['S'],
+    'S': SIM_CODES['S'],
+    '0': SIM_CODES['D'],
+    'D': SIM_CODES['D'],
+    '': SIM_CODES['D'],
+}
 
 
-def map_fsim(fsim_raw: str) -> str:
+def _parse_sim(value: str) -> int:
+    """Integer-parse an unusual ASim/FSim value: 1 => S, anything else => D."""
     try:
-        return 'S' if int(fsim_raw) == 1 else 'D'
-    except Exception:
-        return 'D' if (fsim_raw or '').strip() not in ('1', 'S') else 'S'
+        return SIM_CODES['S'] if int(value) == 1 else SIM_CODES['D']
+    except ValueError:
+        return SIM_CODES['D']
 
 
-def map_dfreq(dfreq_raw: str, config: dict) -> str:
-    """Map DFreq rounded log to L/M/H using config thresholds."""
-    thresholds = config['mapping_thresholds']['dfreq']
-    try:
-        rl = int(str(dfreq_raw).strip())
-    except Exception:
-        return ''
-    if rl <= thresholds['low_max']:
-        return 'L'
-    if rl <= thresholds['medium_max']:
-        return 'M'
-    return 'H'
+def sim_codes(sim_raw: pd.Series) -> np.ndarray:
+    """Map raw ASim/FSim values (1/0 or S/D) to SIM_CODES (0 => S, 1 => D)."""
+    stripped = sim_raw.str.strip()
+    codes = stripped.map(_SIM_CODE_BY_VALUE)
+    unknown = codes.isna()
+    if unknown.any():
+        codes[unknown] = stripped[unknown].map(_parse_sim)
+    return codes.to_numpy(dtype=np.int64)
 
 
-def map_dcom(dcom_raw: str, config: dict) -> str:
-    """Map DCom pop count to L/M/H using config thresholds."""
-    thresholds = config['mapping_thresholds']['dcom']
+def _parse_level(value: str) -> float:
+    """Integer-parse an unusual DFreq/DCom/RCom value with int() (NaN if it fails)."""
     try:
-        pc = int(str(dcom_raw).strip())
-    except Exception:
-        return ''
-    if pc <= thresholds['low_max']:
-        return 'L'
-    if pc <= thresholds['medium_max']:
-        return 'M'
-    return 'H'
+        return int(value)
+    except ValueError:
+        return np.nan
 
 
-def map_rcom(rcom_raw: str, config: dict) -> str:
-    """Map RCom pop count to L/M/H using config thresholds."""
-    thresholds = config['mapping_thresholds']['rcom']
-    try:
-        pc = int(str(rcom_raw).strip())
-    except Exception:
-        return ''
-    if pc <= thresholds['low_max']:
-        return 'L'
-    if pc <= thresholds['medium_max']:
-        return 'M'
-    return 'H'
+def level_codes(raw: pd.Series, thresholds: dict) -> np.ndarray:
+    """Map integer counts to LMH_CODES using config thresholds (-1 if not an integer)."""
+    stripped = raw.str.strip()
+    # Plain digit strings convert in bulk; anything else (e.g. '2.5', '1e1')
+    # goes through int() so only what int() accepts gets a level
+    plain = stripped.str.fullmatch(r'[+-]?[0-9]+')
+    values = pd.to_numeric(stripped.where(plain), errors='coerce')
+    unusual = ~plain & (stripped != '')
+    if unusual.any():
+        values[unusual] = stripped[unusual].map(_parse_level)
+    values = values.to_numpy(dtype=np.float64)
+    # 0 => L (<= low_max), 1 => M (<= medium_max), 2 => H
+    codes = np.digitize(values, [thresholds['low_max'] + 1, thresholds['medium_max'] + 1])
+    return np.where(np.isnan(values), -1, codes)
 
 
-def load_rcom_lookup(frequencies_csv: Path, config: dict) -> Dict[Tuple[str, str, str, str, str], str]:
-    """Load RCom values from frequencies file, keyed by (English, French, MSA, POS, CODA)."""
-    rcom_lookup = {}
+def load_rcom_lookup(frequencies_csv: Path, config: dict) -> pd.Series:
+    """Load RCom values from frequencies file, indexed by (English, French, MSA, POS, CODA)."""
+    key_names = ['english', 'french', 'msa', 'pos', 'coda']
+    empty = pd.Series([], dtype=object, index=pd.MultiIndex.from_tuples([], names=key_names))
     
     if not frequencies_csv.exists():
         print(f"Warning: Frequencies file not found: {frequencies_csv}")
-        return rcom_lookup
+        return empty
     
     cols = config['frequencies_file']['columns']
     
-    with frequencies_csv.open('r', newline='', encoding='utf-8') as f:
-        reader = csv.reader(f)
-        header = next(reader)  # Skip header
-        
-        for row in reader:
-            if len(row) < max(cols.values()) + 1:
-                continue
-            
-            key = (
-                row[cols['english']].strip() if len(row) > cols['english'] else '',
-                row[cols['french']].strip() if len(row) > cols['french'] else '',
-                row[cols['msa']].strip() if len(row) > cols['msa'] else '',
-                row[cols['pos']].strip() if len(row) > cols['pos'] else '',
-                row[cols['coda']].strip() if len(row) > cols['coda'] else ''
-            )
-            rcom_value = row[cols['rcom']].strip() if len(row) > cols['rcom'] else ''
-            if rcom_value and all(key):  # Only add if all key components are non-empty
-                rcom_lookup[key] = rcom_value
+    with frequencies_csv.open('r', buffering=READ_BUFFER_SIZE, newline='', encoding='utf-8') as f:
+        # Skip header; columns are addressed by position from config
+        try:
+            freq = pd.read_csv(f, header=None, skiprows=1, dtype=str, keep_default_na=False)
+        except pd.errors.EmptyDataError:
+            return empty
     
-    return rcom_lookup
+    if freq.shape[1] < max(cols.values()) + 1:
+        return empty
+    
+    lookup = pd.DataFrame({name: freq[cols[name]].fillna('').str.strip() for name in key_names + ['rcom']})
+    # Only add if RCom and all key components are non-empty; later rows win on duplicate keys
+    lookup = lookup[(lookup != '').all(axis=1)].drop_duplicates(subset=key_names, keep='last')
+    return lookup.set_index(key_names)['rcom']
 
 
-def main():
-    parser = argparse.ArgumentParser(description='Compute easiness scores for BASMA words')
-    parser.add_argument('--config', type=str, default=str(DEFAULT_CONFIG),
-                       help='Path to configuration file')
-    args = parser.parse_args()
-    
-    # Load config
-    config_path = Path(args.config)
-    config = load_config(config_path)
+def main(argv: Optional[List[str]] = None, config: Optional[dict] = None):
+    # An already-loaded config (e.g. from run_pipeline) skips argument parsing
+    if config is None:
+        parser = argparse.ArgumentParser(description='Compute easiness scores for BASMA words')
+        parser.add_argument('--config', type=str, default=str(DEFAULT_CONFIG),
+                           help='Path to configuration file')
+        args = parser.parse_args(argv)
+        
+        # Load config
+        config = load_config(Path(args.config))
     
     # Get file paths from config
     root = Path(__file__).parent
@@ -194,79 +222,72 @@ def main():
         raise SystemExit(f"Scores file not found: {scores_csv}")
     
     # Load scoring dictionary from Temp file
-    combo_to_score = parse_temp_scoring(temp_csv, config)
-    print(f"Loaded {len(combo_to_score)} scoring combinations from scoring table")
+    score_arr, cat_arr = parse_temp_scoring(temp_csv, config)
+    n_combos = int((cat_arr != '').sum())
+    print(f"Loaded {n_combos} scoring combinations from scoring table")
     
     # Load RCom lookup from frequencies file
     rcom_lookup = load_rcom_lookup(frequencies_csv, config)
     print(f"Loaded {len(rcom_lookup)} RCom entries from frequencies file")
     
-    with scores_csv.open('r', newline='', encoding='utf-8') as f_in:
-        reader = csv.DictReader(f_in)
-        fieldnames = list(reader.fieldnames or [])
-        
-        # Reorder columns: insert RCom right after DCom, and RComLevel after DComLevel
-        out_fieldnames = []
-        for col in fieldnames:
+    with scores_csv.open('r', buffering=READ_BUFFER_SIZE, newline='', encoding='utf-8') as f_in:
+        df = pd.read_csv(f_in, dtype=str, keep_default_na=False).fillna('')
+    fieldnames = list(df.columns)
+    for col in SCORES_COLUMNS:
+        if col not in df.columns:
+            df[col] = ''
+    
+    # Reorder columns: insert RCom right after DCom, and RComLevel after DComLevel
+    out_fieldnames = []
+    for col in fieldnames:
+        out_fieldnames.append(col)
+        # Insert RCom right after DCom
+        if col == 'DCom':
+            out_fieldnames.append('RCom')
+    
+    # Add remaining extra columns
+    extra_cols = ['ASimLevel', 'FSimLevel', 'DFreqLevel', 'DComLevel', 'EasinessScore', 'EasinessCategory']
+    for col in extra_cols:
+        if col not in out_fieldnames:
             out_fieldnames.append(col)
-            # Insert RCom right after DCom
-            if col == 'DCom':
-                out_fieldnames.append('RCom')
-        
-        # Add remaining extra columns
-        extra_cols = ['ASimLevel', 'FSimLevel', 'DFreqLevel', 'DComLevel', 'EasinessScore', 'EasinessCategory']
-        for col in extra_cols:
-            if col not in out_fieldnames:
-                out_fieldnames.append(col)
-                # Insert RComLevel right after DComLevel
-                if col == 'DComLevel' and 'RComLevel' not in out_fieldnames:
-                    out_fieldnames.append('RComLevel')
-        
-        # Make sure RComLevel is added if DComLevel was already present
-        if 'DComLevel' in out_fieldnames and 'RComLevel' not in out_fieldnames:
-            dcomlevel_idx = out_fieldnames.index('DComLevel')
-            out_fieldnames.insert(dcomlevel_idx + 1, 'RComLevel')
-        
-        with output_csv.open('w', newline='', encoding='utf-8') as f_out:
-            writer = csv.DictWriter(f_out, fieldnames=out_fieldnames)
-            writer.writeheader()
-            
-            for row in reader:
-                asim_level = map_asim(row.get('ASim', ''))
-                fsim_level = map_fsim(row.get('FSim', ''))
-                dfreq_level = map_dfreq(row.get('DFreq', ''), config)
-                dcom_level = map_dcom(row.get('DCom', ''), config)
-                
-                # Get RCom from lookup
-                lookup_key = (
-                    row.get('English', '').strip(),
-                    row.get('French', '').strip(),
-                    row.get('MSA', '').strip(),
-                    row.get('POS', '').strip(),
-                    row.get('CODA', '').strip()
-                )
-                rcom_raw = rcom_lookup.get(lookup_key, '')
-                rcom_level = map_rcom(rcom_raw, config) if rcom_raw else ''
-                
-                # Use 5-factor key: (ASim, FSim, DFreq, DCom, RCom)
-                key = (asim_level, fsim_level, dfreq_level, dcom_level, rcom_level)
-                score_cat = combo_to_score.get(key)
-                if score_cat is None:
-                    easiness_score = ''
-                    easiness_cat = ''
-                else:
-                    easiness_score, easiness_cat = score_cat
-                
-                row['ASimLevel'] = asim_level
-                row['FSimLevel'] = fsim_level
-                row['DFreqLevel'] = dfreq_level
-                row['DComLevel'] = dcom_level
-                row['RCom'] = rcom_raw  # Raw numeric RCom value
-                row['RComLevel'] = rcom_level  # Mapped to L/M/H
-                row['EasinessScore'] = easiness_score
-                row['EasinessCategory'] = easiness_cat
-                
-                writer.writerow(row)
+            # Insert RComLevel right after DComLevel
+            if col == 'DComLevel' and 'RComLevel' not in out_fieldnames:
+                out_fieldnames.append('RComLevel')
+    
+    # Make sure RComLevel is added if DComLevel was already present
+    if 'DComLevel' in out_fieldnames and 'RComLevel' not in out_fieldnames:
+        dcomlevel_idx = out_fieldnames.index('DComLevel')
+        out_fieldnames.insert(dcomlevel_idx + 1, 'RComLevel')
+    
+    thresholds = config['mapping_thresholds']
+    asim = sim_codes(df['ASim'])
+    fsim = sim_codes(df['FSim'])
+    dfreq = level_codes(df['DFreq'], thresholds['dfreq'])
+    dcom = level_codes(df['DCom'], thresholds['dcom'])
+    
+    # Get RCom from lookup (raw numeric value), keyed by the stripped concept/word columns
+    lookup_keys = pd.MultiIndex.from_arrays(
+        [df[col].str.strip() for col in ('English', 'French', 'MSA', 'POS', 'CODA')]
+    )
+    df['RCom'] = rcom_lookup.reindex(lookup_keys).fillna('').to_numpy()
+    rcom = level_codes(df['RCom'], thresholds['rcom'])
+    
+    df['ASimLevel'] = SIM_NAMES[asim]
+    df['FSimLevel'] = SIM_NAMES[fsim]
+    df['DFreqLevel'] = LMH_NAMES[dfreq]
+    df['DComLevel'] = LMH_NAMES[dcom]
+    df['RComLevel'] = LMH_NAMES[rcom]
+    
+    # Use 5-factor key: (ASim, FSim, DFreq, DCom, RCom), packed into one index and
+    # gathered from the scoring arrays; rows with a missing level stay unscored
+    scored = (dfreq >= 0) & (dcom >= 0) & (rcom >= 0)
+    keys = np.where(scored, encode_combo(asim, fsim, dfreq, dcom, rcom), 0)
+    scored &= cat_arr[keys] != ''
+    df['EasinessScore'] = np.where(scored, score_arr[keys].astype(str), '')
+    df['EasinessCategory'] = np.where(scored, cat_arr[keys], '')
+    
+    with output_csv.open('w', buffering=WRITE_BUFFER_SIZE, newline='', encoding='utf-8') as f_out:
+        df[out_fieldnames].to_csv(f_out, index=False, lineterminator='\r\n', chunksize=WRITE_BATCH_ROWS)
     
     print(f"Wrote: {output_csv}")
 
@@ -5,18 +5,31 @@ import re
 #helpers for normalization
 DIACRITICS = re.compile(r'[\u0617-\u061A\u064B-\u0652]')
 WEAK_LETTERS_PATTERN = re.compile(r"[اويىأةٱآأإؤئء]")
-
-def undiatratize(text):
-    return DIACRITICS.sub("", str(text)) if text is not None else ""
-
-def remove_weak_letters(text):
-    if text is None:
-        return ""
-    s = undiatratize(text)
-    s = s.replace("،", " ")
-    s = re.sub(r"[^\w\s\u0600-\u06FF]", "", s)
-    s = WEAK_LETTERS_PATTERN.sub("", s)
-    return re.sub(r"\s+", " ", s).strip()
+NON_WORD_PATTERN = re.compile(r"[^\w\s\u0600-\u06FF]")
+PUNCTUATION_PATTERN = re.compile(r"[^\w\s]")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+#applied to whole columns (missing values become ""); patterns are passed compiled
+#so pandas matches with Python re (unicode \w and \s) whatever string backend it uses
+def undiatratize_series(series):
+    return series.fillna("").astype(str).str.replace(DIACRITICS, "", regex=True)
+
+def remove_weak_letters_series(series):
+    s = undiatratize_series(series).str.replace("،", " ", regex=False)
+    s = s.str.replace(NON_WORD_PATTERN, "", regex=True)
+    s = s.str.replace(WEAK_LETTERS_PATTERN, "", regex=True)
+    return s.str.replace(WHITESPACE_PATTERN, " ", regex=True).str.strip()
+
+#sum looked-up values of exploded parts back onto their original rows (unknown parts count 0)
+def sum_lookup(parts, lookup):
+    lookup = pd.Series(lookup)
+    known = parts.isin(lookup.index)
+    values = pd.Series(0, index=parts.index, dtype=lookup.dtype)
+    values[known] = parts[known].map(lookup)
+    totals = values.groupby(level=0).sum()
+    #a NaN value makes the whole row sum NaN, as with a plain sum()
+    totals[values.isna().groupby(level=0).any()] = np.nan
+    return totals
 
 def extract_pos(tag):
     if tag is None:
@@ -32,14 +45,13 @@ df["POS"] = df["MSA_lemma_POS"].apply(extract_pos)
 
 #compute MSA frequency
 msa_freq = pd.read_csv("MSA_freq_lists.tsv", sep="\t", header=None, names=["Word", "Frequency"])
-msa_freq["Word"] = msa_freq["Word"].apply(undiatratize).str.strip()
+msa_freq["Word"] = undiatratize_series(msa_freq["Word"]).str.strip()
 msa_dict = dict(zip(msa_freq["Word"], msa_freq["Frequency"]))
 
-def get_msa_freq(text):
-    parts = [undiatratize(p).strip() for p in str(text).split("،") if p.strip()]
-    return sum(msa_dict.get(p, 0) for p in parts)
-
-df["MSA_Frequency"] = df["MSA"].apply(get_msa_freq)
+#one row per MSA part; blank parts are skipped
+msa_parts = df["MSA"].fillna("").str.split("،").explode()
+msa_keys = undiatratize_series(msa_parts).str.strip().where(msa_parts.str.strip() != "", None)
+df["MSA_Frequency"] = sum_lookup(msa_keys, msa_dict)
 
 #compute dialect frequency
 da_freq = pd.read_csv("DA_freq_lists.tsv", sep="\t", header=None, names=["Word", "Frequency"])
@@ -47,19 +59,15 @@ da_freq["Word"] = da_freq["Word"].str.strip()
 da_freq["Frequency"] = pd.to_numeric(da_freq["Frequency"], errors="coerce")
 da_dict = dict(zip(da_freq["Word"], da_freq["Frequency"]))
 
-def get_da_freq(text):
-    text = re.sub(r"[^\w\s]", "", str(text))
-    return sum(da_dict.get(w, 0) for w in text.split())
-
-df["DA_Frequency"] = df["CODA"].apply(get_da_freq)
+#one row per whitespace-separated CODA word, punctuation removed
+da_words = df["CODA"].fillna("").str.replace(PUNCTUATION_PATTERN, "", regex=True).str.split().explode()
+df["DA_Frequency"] = sum_lookup(da_words, da_dict)
 
 #ASim: check similarity after normalization 
-def compute_asim(row):
-    cod = remove_weak_letters(row["CODA"])
-    msa_list = [remove_weak_letters(p) for p in str(row["MSA"]).split("،")]
-    return int(cod != "" and cod in msa_list)
-
-df["ASim"] = df.apply(compute_asim, axis=1)
+coda_norm = remove_weak_letters_series(df["CODA"])
+msa_norm = remove_weak_letters_series(msa_parts)
+asim_match = (msa_norm == coda_norm.reindex(msa_norm.index)).groupby(level=0).any()
+df["ASim"] = ((coda_norm != "") & asim_match).astype(int)
 
 #map dialect cities to regions
 DIA_LABEL_TO_REGION = {
@@ -72,32 +80,37 @@ DIA_LABEL_TO_REGION = {
     "DOH": "Qatar+Saudi+Oman+Yemen ", "RIY": "Qatar+Saudi+Oman+Yemen ", "JED": "Qatar+Saudi+Oman+Yemen ", "MUS": "Qatar+Saudi+Oman+Yemen ", "SAN": "Qatar+Saudi+Oman+Yemen ",
 }
 
-def dialects_to_regions(text):
-    parts = [p.strip() for p in str(text).split(",") if p.strip()]
-    regions = list(dict.fromkeys(DIA_LABEL_TO_REGION[p] for p in parts if p in DIA_LABEL_TO_REGION))
-    return ", ".join(regions), len(regions)
+#regions of comma-separated dialect labels, each region once in first-seen order;
+#returns (joined regions, region count) aligned with the input
+def dialects_to_regions(dialects):
+    labels = pd.Series(dialects.to_numpy(), dtype=object).fillna("").astype(str)
+    regions = labels.str.split(",").explode().str.strip().map(DIA_LABEL_TO_REGION).dropna()
+    regions = regions[~pd.MultiIndex.from_arrays([regions.index, regions]).duplicated()]
+    by_row = regions.groupby(level=0)
+    joined = by_row.agg(", ".join).reindex(labels.index, fill_value="")
+    counts = by_row.size().reindex(labels.index, fill_value=0)
+    return joined.set_axis(dialects.index), counts.set_axis(dialects.index)
 
 #load transliteration file
 translit_df = pd.read_csv("MADAR_Lexicon_transliteration.tsv", sep="\t")
 translit_df.columns = [c.strip() for c in translit_df.columns]
 
-def split_translit(text):
-    return [t.strip() for t in str(text).split(",")]
-
-translit_df["EN_AR_list"] = translit_df["EN_ARTransliteration"].apply(split_translit)
-translit_df["FR_AR_list"] = translit_df["FR_ARTransliteration"].apply(split_translit)
+#one row per normalized transliteration of each word; as with a dict lookup, a
+#word listed more than once uses its last row
+def normalized_translits(word_col, translit_col):
+    rows = translit_df.drop_duplicates(word_col, keep="last")
+    parts = rows[translit_col].fillna("").astype(str).str.split(",").explode().str.strip()
+    return pd.MultiIndex.from_arrays([rows[word_col].reindex(parts.index), remove_weak_letters_series(parts)])
 
-en_trans = dict(zip(translit_df["English Word"], translit_df["EN_AR_list"]))
-fr_trans = dict(zip(translit_df["French Word"], translit_df["FR_AR_list"]))
+en_trans = normalized_translits("English Word", "EN_ARTransliteration")
+fr_trans = normalized_translits("French Word", "FR_ARTransliteration")
 
 #FSim: check if dialectal word matches any transliteration 
-def compute_fsim(row):
-    cod = remove_weak_letters(undiatratize(row["CODA"]))
-    translits = en_trans.get(row["English"], []) + fr_trans.get(row["French"], [])
-    translits = [remove_weak_letters(undiatratize(t)) for t in translits]
-    return int(cod in translits and cod != "")
-
-df["FSim"] = df.apply(compute_fsim, axis=1)
+fsim_match = (
+    pd.MultiIndex.from_arrays([df["English"], coda_norm]).isin(en_trans)
+    | pd.MultiIndex.from_arrays([df["French"], coda_norm]).isin(fr_trans)
+)
+df["FSim"] = ((coda_norm != "") & fsim_match).astype(int)
 
 #load roots file
 roots_df = pd.read_csv("roots.tsv", sep="\t")
@@ -109,32 +122,32 @@ roots_df["cleaned_dia_root"] = roots_df["cleaned_dia_root"].str.strip()
 dia2root = roots_df.set_index("dia_word")["cleaned_dia_root"].to_dict()
 df["Root"] = df["CODA"].astype(str).str.strip().map(dia2root)
 
-#handel cases with multiple roots
-def split_roots_str(root_str):
-    if pd.isna(root_str):
-        return []
-    s = str(root_str).strip()
-    if not s or s.lower() == "nan":
-        return []
-    return [r.strip() for r in s.split("،") if r.strip()]
+#handel cases with multiple roots: one row per root, keeping the original row index
+#(rows without a root are dropped)
+def explode_roots(root_series):
+    s = root_series.dropna().astype(str).str.strip()
+    s = s[(s != "") & (s.str.lower() != "nan")]
+    parts = s.str.split("،").explode().str.strip()
+    return parts[parts != ""]
 
 #build mapping from root+concept to dialects (RCom per concept)
-root_concept_to_dialects = {}
-
-for _, row in df.dropna(subset=["Dialect"]).iterrows():
-    dialect_label = row["Dialect"]
-    concept_key = (row["English"], row["French"], row["MSA"])
-    for r in split_roots_str(row["Root"]):
-        key = (r, concept_key)
-        if key not in root_concept_to_dialects:
-            root_concept_to_dialects[key] = set()
-        root_concept_to_dialects[key].add(dialect_label)
-
-root_concept_dialects = pd.Series(
-    {key: ", ".join(sorted(dials)) for key, dials in root_concept_to_dialects.items()}
+concept_cols = ["English", "French", "MSA"]
+dialect_rows = df.dropna(subset=["Dialect"])
+dialect_roots = explode_roots(dialect_rows["Root"]).rename("RootPart")
+
+#distinct dialects sorted before grouping, so each group only needs a join
+root_concept_dialects = (
+    dialect_rows[concept_cols + ["Dialect"]]
+    .merge(dialect_roots, left_index=True, right_index=True)
+    .drop_duplicates()
+    .sort_values("Dialect")
+    .groupby(["RootPart"] + concept_cols)["Dialect"]
+    .agg(", ".join)
 )
 
-root_concept_regions = root_concept_dialects.apply(dialects_to_regions)
+root_concept_regions = pd.DataFrame(
+    dict(zip(["Regions", "Count"], dialects_to_regions(root_concept_dialects)))
+).reset_index()
 
 #group rows into one entry per dialectal word
 group_cols = ["English", "French", "MSA", "POS", "CODA"]
@@ -153,45 +166,45 @@ combined = (
 )
 
 #DCom calculations: regions and counts for each dialect word
-regions = combined["Dialect"].apply(dialects_to_regions)
-combined["DCom_Regions"] = regions.apply(lambda x: x[0])
-combined["DCom"] = regions.apply(lambda x: x[1])
+combined["DCom_Regions"], combined["DCom"] = dialects_to_regions(combined["Dialect"])
 
 #RCom calculations: regions and counts for each root within the same concept
-def compute_rcom(row):
-    root_str = row["Root"]
-    roots = split_roots_str(root_str)
-    concept_key = (row["English"], row["French"], row["MSA"])
-
-    #if there is no root, fallback to DCom count and regions
-    if not roots:
-        return row["DCom_Regions"], row["DCom"]
-
-    all_regions = []
-    counts = []
-    for r in roots:
-        key = (r, concept_key)
-        region_str, cnt = root_concept_regions.get(key, ("", 0))
-        counts.append(cnt)
-        if region_str:
-            all_regions.extend(
-                [rg.strip() for rg in region_str.split(",") if rg.strip()]
-            )
-    unique_regions_str = ", ".join(sorted(set(all_regions))) if all_regions else ""
-    max_count = max(counts) if counts else 0
-    return unique_regions_str, max_count
-
-combined[["RCom_Regions", "RCom"]] = combined.apply(
-    lambda row: pd.Series(compute_rcom(row)),
-    axis=1
+combined_roots = explode_roots(combined["Root"]).rename("RootPart")
+rcom_parts = (
+    combined[concept_cols]
+    .merge(combined_roots, left_index=True, right_index=True)
+    .rename_axis("row")
+    .reset_index()
+    .merge(root_concept_regions, on=["RootPart"] + concept_cols, how="left")
+)
+
+#highest count over the roots (0 for roots not seen with any dialect)
+rcom_count = rcom_parts["Count"].fillna(0).groupby(rcom_parts["row"]).max().astype(int)
+
+#sorted union of the individual region names over the roots
+region_parts = (
+    rcom_parts.set_index("row")["Regions"].fillna("")
+    .str.split(",").explode().str.strip()
+    .rename("Region").reset_index()
 )
+region_parts = region_parts[region_parts["Region"] != ""].drop_duplicates()
+rcom_regions = region_parts.sort_values(["row", "Region"]).groupby("row")["Region"].agg(", ".join)
+
+#if there is no root, fallback to DCom count and regions
+has_roots = combined.index.isin(combined_roots.index)
+combined["RCom_Regions"] = rcom_regions.reindex(combined.index, fill_value="").where(has_roots, combined["DCom_Regions"])
+combined["RCom"] = rcom_count.reindex(combined.index, fill_value=0).where(has_roots, combined["DCom"])
 
 combined["Root"] = combined["Root"].fillna("")
 
 #compute rounded of frequencies for DFreq and MSAFreq
 def log_round(series):
-    s = series.fillna(0)
-    return s.apply(lambda x: int(round(np.log10(x))) if x > 0 else 0)
+    s = series.fillna(0).to_numpy(dtype=float)
+    out = np.zeros(len(s), dtype=np.int64)
+    mask = s > 0
+    #rint rounds halves to even, like round()
+    out[mask] = np.rint(np.log10(s[mask])).astype(np.int64)
+    return pd.Series(out, index=series.index)
 
 combined["DFreq"] = log_round(combined["DA_Frequency"])
 combined["MSAFreq"] = log_round(combined["MSA_Frequency"])
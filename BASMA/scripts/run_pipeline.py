@@ -10,26 +10,107 @@ The pipeline runs:
 2. compute_easiness.py - Compute easiness scores
 3. select_targets.py - Select best Easy/Medium/Hard words per concept
 4. select_targets_all.py - Generate long-form files
+
+Steps 3 and 4 only depend on step 2, so they run concurrently.
+
+Steps run inside this interpreter by default; pass --isolate to run each
+one in its own Python subprocess instead.
 """
 
 import sys
 import subprocess
 import json
+import importlib
+import os
+import runpy
+import tempfile
+import traceback
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
+from typing import List, Optional, Tuple
 import argparse
 
+try:
+    # Faster JSON decoding when available; both accept bytes
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+# Pipeline steps as a small DAG: (script, description, scripts it depends on)
+PIPELINE_STEPS = [
+    ('extract.py', 'Extract features from MADAR lexicon', []),
+    ('compute_easiness.py', 'Compute easiness scores', ['extract.py']),
+    ('select_targets.py', 'Select best Easy/Medium/Hard words', ['compute_easiness.py']),
+    ('select_targets_all.py', 'Generate long-form files', ['compute_easiness.py']),
+]
+
+# Steps exposing main(argv); the others are plain scripts run via runpy
+IMPORTABLE_STEPS = {'compute_easiness.py', 'select_targets.py', 'select_targets_all.py'}
+
 
 def load_config(config_path: Path) -> dict:
     """Load configuration from JSON file."""
     if not config_path.exists():
         raise FileNotFoundError(f"Config file not found: {config_path}")
     
-    with config_path.open('r') as f:
-        return json.load(f)
+    with config_path.open('rb') as f:
+        return _json_loads(f.read())
+
+
+def run_in_process(script_path: Path, config: dict) -> bool:
+    """Run a pipeline step inside this interpreter and return success status."""
+    try:
+        if script_path.name in IMPORTABLE_STEPS:
+            if str(script_path.parent) not in sys.path:
+                sys.path.insert(0, str(script_path.parent))
+            module = importlib.import_module(script_path.stem)
+            module.main(config=config)
+        else:
+            # Plain scripts resolve their inputs relative to the working directory.
+            # They have no concurrent siblings in the DAG, so chdir is safe here.
+            cwd = os.getcwd()
+            os.chdir(script_path.parent)
+            try:
+                runpy.run_path(str(script_path), run_name='__main__')
+            finally:
+                os.chdir(cwd)
+    except SystemExit as e:
+        if e.code in (None, 0):
+            return True
+        print(f"ERROR: {script_path.name} failed: {e.code}")
+        return False
+    except Exception:
+        traceback.print_exc()
+        print(f"ERROR: {script_path.name} failed")
+        return False
+    return True
+
+
+def run_subprocess(script_path: Path, config_path: Path) -> bool:
+    """Run a pipeline step in a fresh Python process and return success status."""
+    # Output is streamed straight to our stdout/stderr rather than captured
+    process = subprocess.Popen(
+        [sys.executable, str(script_path), '--config', str(config_path)],
+        cwd=script_path.parent,
+    )
+    returncode = process.wait()
+    if returncode != 0:
+        print(f"ERROR: {script_path.name} failed with exit code {returncode}")
+        return False
+    return True
 
 
-def run_script(script_name: str, config: dict, verbose: bool = True) -> bool:
-    """Run a Python script and return success status."""
+def run_script(
+    script_name: str,
+    config: dict,
+    config_path: Path,
+    verbose: bool = True,
+    isolate: bool = False,
+) -> bool:
+    """
+    Run a Python script and return success status. In-process steps get the
+    loaded `config`; isolated ones get `--config config_path`.
+    """
     script_path = Path(__file__).parent / script_name
     
     if not script_path.exists():
@@ -41,22 +122,49 @@ def run_script(script_name: str, config: dict, verbose: bool = True) -> bool:
         print(f"Running: {script_name}")
         print(f"{'='*60}")
     
-    try:
-        result = subprocess.run(
-            [sys.executable, str(script_path)],
-            cwd=script_path.parent,
-            check=True,
-            capture_output=not verbose,
-            text=True
-        )
-        if verbose and result.stdout:
-            print(result.stdout)
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"ERROR: {script_name} failed with exit code {e.returncode}")
-        if e.stderr:
-            print(f"Error output: {e.stderr}")
-        return False
+    if isolate:
+        return run_subprocess(script_path, config_path)
+    return run_in_process(script_path, config)
+
+
+def run_steps(
+    steps: List[Tuple[str, str, List[str]]],
+    config: dict,
+    config_path: Path,
+    verbose: bool = True,
+    isolate: bool = False,
+) -> Optional[str]:
+    """
+    Run steps as a DAG, launching each one as soon as its dependencies have
+    succeeded. Dependencies not in `steps` (e.g. a skipped extract) count as done.
+    Returns the name of the first failed script, or None on success.
+    """
+    done = {script for script, _, _ in PIPELINE_STEPS} - {script for script, _, _ in steps}
+    pending = list(steps)
+    running = {}
+    
+    with ThreadPoolExecutor(max_workers=len(steps) or 1) as executor:
+        while pending or running:
+            ready = [step for step in pending if all(dep in done for dep in step[2])]
+            for step in ready:
+                script, description, _ = step
+                pending.remove(step)
+                print(f"\n[{steps.index(step) + 1}/{len(steps)}] {description}")
+                running[executor.submit(run_script, script, config, config_path, verbose, isolate)] = script
+            
+            if not running:
+                # Remaining steps depend on something that never ran
+                return pending[0][0]
+            
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                script = running.pop(future)
+                if not future.result():
+                    # Leaving the executor waits for any stages still running
+                    return script
+                done.add(script)
+    
+    return None
 
 
 def main():
@@ -74,6 +182,11 @@ def main():
         action='store_true',
         help='Skip the extract.py step (use existing intermediate files)'
     )
+    parser.add_argument(
+        '--isolate',
+        action='store_true',
+        help='Run each step in its own Python subprocess instead of in-process'
+    )
     parser.add_argument(
         '--verbose',
         action='store_true',
@@ -93,27 +206,32 @@ def main():
         return 1
     
     # Pipeline steps
-    steps = []
-    
-    if not args.skip_extract:
-        steps.append(('extract.py', 'Extract features from MADAR lexicon'))
-    
-    steps.extend([
-        ('compute_easiness.py', 'Compute easiness scores'),
-        ('select_targets.py', 'Select best Easy/Medium/Hard words'),
-        ('select_targets_all.py', 'Generate long-form files')
-    ])
+    steps = [
+        step for step in PIPELINE_STEPS
+        if not (args.skip_extract and step[0] == 'extract.py')
+    ]
     
     # Run pipeline
     print(f"\n{'='*60}")
     print("BASMA Easiness Computation Pipeline")
     print(f"{'='*60}")
     
-    for i, (script, description) in enumerate(steps, 1):
-        print(f"\n[{i}/{len(steps)}] {description}")
-        if not run_script(script, config, args.verbose):
-            print(f"\nPipeline failed at step {i}: {script}")
-            return 1
+    step_config_path = config_path
+    if args.isolate:
+        # Subprocesses read a dump of the already-loaded config
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False, encoding='utf-8') as tmp:
+            json.dump(config, tmp)
+        step_config_path = Path(tmp.name)
+    
+    try:
+        failed = run_steps(steps, config, step_config_path, args.verbose, args.isolate)
+    finally:
+        if step_config_path != config_path:
+            step_config_path.unlink()
+    if failed:
+        step_num = [script for script, _, _ in steps].index(failed) + 1
+        print(f"\nPipeline failed at step {step_num}: {failed}")
+        return 1
     
     print(f"\n{'='*60}")
     print("Pipeline completed successfully!")
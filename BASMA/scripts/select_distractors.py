@@ -19,17 +19,54 @@ with Easy_distractor / Medium_distractor / Hard_distractor columns filled.
 from __future__ import annotations
 
 import csv
+import itertools
 import random
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+import numpy as np
+
+try:
+    # C++ Levenshtein kernels; fall back to the pure-Python DP below if missing
+    from rapidfuzz import process as rf_process
+    from rapidfuzz.distance import Levenshtein
+except ImportError:
+    rf_process = None
+    Levenshtein = None
+
+try:
+    # C per-pair Levenshtein for edit_distance when rapidfuzz is missing
+    from polyleven import levenshtein as _lev
+except ImportError:
+    try:
+        from Levenshtein import distance as _lev
+    except ImportError:
+        _lev = None
+
 ROOT = Path(__file__).resolve().parent.parent
 GROUPED_CSV = ROOT / "data" / "output" / "BASMA Plan - Concepts Grouped.csv"
 RANDOM_SELECT_CSV = ROOT / "data" / "output" / "BASMA Plan - Random Select.csv"
 OUTPUT_CSV = ROOT / "data" / "output" / "BASMA Plan - Random Select with Distractors.csv"
 
-# Use a fixed seed for reproducibility
-random.seed(42)
+# Read buffer for CSV inputs (1MB) to cut down on read() syscalls
+READ_BUFFER_SIZE = 1 << 20
+# Output is written through a 1MB buffer in batches of rows
+WRITE_BUFFER_SIZE = 1 << 20
+WRITE_BATCH_ROWS = 4096
+
+# Fixed seed for reproducibility; each concept gets its own RNG derived from
+# it, so picks do not depend on processing order or worker assignment
+SEED = 42
+# Concepts handed to each worker process at a time
+WORKER_CHUNKSIZE = 64
+
+# Read-only state broadcast to worker processes by _init_worker
+_worker_concepts: Dict[str, dict] = {}
+_worker_pools_by_pos: Dict[str, Dict[str, List[Tuple[str, str]]]] = {}
+# rapidfuzz cdist threads; a single thread inside worker processes, which
+# already run one per CPU
+_cdist_workers = -1
 
 
 def split_words(raw: str) -> List[str]:
@@ -41,7 +78,9 @@ def split_words(raw: str) -> List[str]:
 
 
 def edit_distance(a: str, b: str) -> int:
-    """Compute Levenshtein distance (iterative DP)."""
+    """Compute Levenshtein distance (C extension if installed, else iterative DP)."""
+    if _lev is not None:
+        return _lev(a, b)
     if a == b:
         return 0
     if not a:
@@ -53,35 +92,86 @@ def edit_distance(a: str, b: str) -> int:
     if len(a) > len(b):
         a, b = b, a
 
+    # Two preallocated rows, swapped each pass instead of rebuilt; the
+    # diagonal and left cells are carried in locals
     prev = list(range(len(a) + 1))
+    curr = [0] * (len(a) + 1)
     for j, bj in enumerate(b, start=1):
-        curr = [j]
+        curr[0] = left = j
+        diag = j - 1
         for i, ai in enumerate(a, start=1):
-            cost = 0 if ai == bj else 1
-            curr.append(
-                min(
-                    prev[i] + 1,      # deletion
-                    curr[i - 1] + 1,  # insertion
-                    prev[i - 1] + cost,  # substitution
-                )
-            )
-        prev = curr
+            up = prev[i]
+            best = diag if ai == bj else diag + 1  # substitution
+            if up + 1 < best:
+                best = up + 1    # deletion
+            if left + 1 < best:
+                best = left + 1  # insertion
+            curr[i] = left = best
+            diag = up
+        prev, curr = curr, prev
     return prev[-1]
 
 
-def normalized_distance(a: str, b: str) -> float:
-    """Normalized Levenshtein distance in [0, 1]."""
-    if not a and not b:
-        return 0.0
-    dist = edit_distance(a, b)
-    denom = max(len(a), len(b), 1)
-    return dist / denom
+def edit_distance_matrix(words: List[str], anchors: List[str], cutoff: int) -> np.ndarray:
+    """
+    Levenshtein distance for every (word, anchor) pair. Distances above
+    `cutoff` may be reported as any value > cutoff (rapidfuzz stops early).
+    """
+    if rf_process is not None:
+        return rf_process.cdist(
+            words,
+            anchors,
+            scorer=Levenshtein.distance,
+            score_cutoff=cutoff,
+            dtype=np.int32,
+            workers=_cdist_workers,
+        )
+    return np.array([[edit_distance(w, a) for a in anchors] for w in words])
+
+
+def min_normalized_distances(words: List[str], anchors: List[str]) -> np.ndarray:
+    """
+    Minimum normalized edit distance from each word to any anchor, counting
+    only pairs within the hard-slot limit (normalized <= 2 / len(word));
+    inf for words with no such anchor.
+
+    A pair qualifies iff d * len(w) <= 2 * max(len(w), len(a)). Since
+    d >= |len(w) - len(a)|, anchors failing that bound on length alone are
+    skipped, and the rest are scored with an early-exit distance cutoff.
+    Words are handled in groups of equal length so each group gets a
+    single batched call.
+    """
+    if not anchors:
+        return np.ones(len(words))
+
+    min_scores = np.full(len(words), np.inf)
+    word_lens = np.array([len(w) for w in words])
+    anchor_lens = np.array([len(a) for a in anchors])
+
+    for length in np.unique(word_lens):
+        w_len = max(int(length), 1)
+        w_idx = np.flatnonzero(word_lens == length)
+        denom = np.maximum(anchor_lens, w_len)  # max(len(w), len(a), 1)
+        a_idx = np.flatnonzero(np.abs(anchor_lens - length) * w_len <= 2 * denom)
+        if not a_idx.size:
+            continue
+
+        max_dists = 2 * denom[a_idx] // w_len  # largest qualifying distance per anchor
+        dists = edit_distance_matrix(
+            [words[i] for i in w_idx],
+            [anchors[j] for j in a_idx],
+            cutoff=int(max_dists.max()),
+        )
+        scores = np.where(dists <= max_dists, dists / denom[a_idx], np.inf)
+        min_scores[w_idx] = scores.min(axis=1)
+
+    return min_scores
 
 
 def load_grouped() -> Dict[str, dict]:
     """Load grouped concepts into a dict keyed by ID."""
     concepts: Dict[str, dict] = {}
-    with GROUPED_CSV.open("r", encoding="utf-8") as f:
+    with GROUPED_CSV.open("r", buffering=READ_BUFFER_SIZE, encoding="utf-8") as f:
         reader = csv.DictReader(f)
         for row in reader:
             cid = row.get("ID", "").strip()
@@ -119,11 +209,30 @@ def build_candidates(concepts: Dict[str, dict]) -> List[Tuple[str, str, str, str
     return pool
 
 
+def bucket_candidates(
+    candidates: List[Tuple[str, str, str, str]],
+) -> Dict[str, Dict[str, List[Tuple[str, str]]]]:
+    """
+    Group candidates by POS into "easy_med", "hard" and "all" pools of
+    (word, cid), preserving candidate order. Built once so each row only
+    scans the candidates of its own POS.
+    """
+    pools_by_pos: Dict[str, Dict[str, List[Tuple[str, str]]]] = {}
+    for w, pos, cid, lvl in candidates:
+        pools = pools_by_pos.setdefault(pos, {"easy_med": [], "hard": [], "all": []})
+        if lvl in {"easy", "medium"}:
+            pools["easy_med"].append((w, cid))
+        elif lvl == "hard":
+            pools["hard"].append((w, cid))
+        pools["all"].append((w, cid))
+    return pools_by_pos
+
+
 def select_distractors(
     anchors: List[str],
-    pos: str,
     cid: str,
-    candidates: List[Tuple[str, str, str, str]],
+    pools: Dict[str, List[Tuple[str, str]]],
+    rng: random.Random,
 ) -> List[str]:
     """
     Select exactly three distractors (easy/medium/hard slots) using three pools:
@@ -131,47 +240,51 @@ def select_distractors(
     - Medium slot: random from hard words (same POS, other concepts) -> [hard]
     - Hard slot: random from top 6 closest (edit distance <= 2) same POS, other concepts -> [edit]
     Falls back to other pools if a primary pool is empty.
+
+    `pools` are the same-POS buckets from `bucket_candidates`; all random
+    draws come from `rng`.
     """
-    # Partition pools (same POS, other concepts, not anchors)
+    anchors_set = frozenset(anchors)
+
+    # Restrict pools to other concepts, not anchors
     easy_med_pool = [
-        w for (w, c_pos, c_cid, lvl) in candidates
-        if c_pos == pos and c_cid != cid and w not in anchors and lvl in {"easy", "medium"}
+        w for (w, c_cid) in pools.get("easy_med", [])
+        if c_cid != cid and w not in anchors_set
     ]
 
     hard_pool = [
-        w for (w, c_pos, c_cid, lvl) in candidates
-        if c_pos == pos and c_cid != cid and w not in anchors and lvl == "hard"
+        w for (w, c_cid) in pools.get("hard", [])
+        if c_cid != cid and w not in anchors_set
     ]
 
     edit_pool = [
-        w for (w, c_pos, c_cid, _) in candidates
-        if c_pos == pos and c_cid != cid and w not in anchors
+        w for (w, c_cid) in pools.get("all", [])
+        if c_cid != cid and w not in anchors_set
     ]
 
     picks: List[str] = []
 
     # Easy slot
-    random.shuffle(easy_med_pool)
+    rng.shuffle(easy_med_pool)
     easy_pick = easy_med_pool[0] if easy_med_pool else ""
     if easy_pick:
         picks.append(f"{easy_pick} [rand]")
 
     # Medium slot
-    random.shuffle(hard_pool)
+    rng.shuffle(hard_pool)
     med_pick = hard_pool[0] if hard_pool else ""
     if med_pick:
         picks.append(f"{med_pick} [hard]")
 
     # Hard slot via edit distance (<=2), pick randomly from top 6
     if edit_pool:
-        scored = []
-        for w in edit_pool:
-            score = min(normalized_distance(w, a) for a in anchors) if anchors else 1.0
-            scored.append((score, w))
-        scored = [sw for sw in scored if sw[0] <= 2 / max(len(sw[1]), 1)]  # normalized <= 2 chars
-        scored.sort(key=lambda x: x[0])
-        top_edit = [w for _, w in scored[:6]] if scored else []
-        random.shuffle(top_edit)
+        min_scores = min_normalized_distances(edit_pool, anchors)
+        lengths = np.array([len(w) for w in edit_pool])
+        keep = np.flatnonzero(min_scores <= 2 / np.maximum(lengths, 1))  # normalized <= 2 chars
+        # Stable sort keeps pool order among ties, so the top 6 match a plain sort
+        top_idx = keep[np.argsort(min_scores[keep], kind="stable")[:6]]
+        top_edit = [edit_pool[i] for i in top_idx]
+        rng.shuffle(top_edit)
         hard_pick = top_edit[0] if top_edit else ""
     else:
         hard_pick = ""
@@ -180,21 +293,15 @@ def select_distractors(
         picks.append(f"{hard_pick} [edit]")
 
     # Fallbacks to ensure three outputs
-    pools_for_fallback = [
-        easy_med_pool,
-        hard_pool,
-        edit_pool,
-    ]
-    flat_fallback = []
-    for pool in pools_for_fallback:
-        flat_fallback.extend(pool)
-    random.shuffle(flat_fallback)
+    # Deduplicate (keeping first-seen order) so no candidate is tried twice
+    flat_fallback = list(dict.fromkeys(itertools.chain(easy_med_pool, hard_pool, edit_pool)))
+    rng.shuffle(flat_fallback)
 
     existing_words = {p.split(" [")[0] for p in picks}
     for w in flat_fallback:
         if len(picks) >= 3:
             break
-        if w in existing_words or w in anchors:
+        if w in existing_words or w in anchors_set:
             continue
         picks.append(f"{w} [rand]")
         existing_words.add(w)
@@ -206,6 +313,29 @@ def select_distractors(
     return picks[:3]
 
 
+def _init_worker(
+    concepts: Dict[str, dict],
+    pools_by_pos: Dict[str, Dict[str, List[Tuple[str, str]]]],
+) -> None:
+    """Store the shared read-only state once per worker process."""
+    global _worker_concepts, _worker_pools_by_pos, _cdist_workers
+    _worker_concepts = concepts
+    _worker_pools_by_pos = pools_by_pos
+    _cdist_workers = 1
+
+
+def _select_for_concept(cid: str) -> Tuple[str, List[str]]:
+    """Worker entry point: select distractors for one concept ID."""
+    concept = _worker_concepts[cid]
+    picks = select_distractors(
+        anchors=concept["all_words"],
+        cid=cid,
+        pools=_worker_pools_by_pos.get(concept["pos"], {}),
+        rng=random.Random(f"{SEED}:{cid}"),
+    )
+    return cid, picks
+
+
 def main() -> None:
     if not GROUPED_CSV.exists():
         raise SystemExit(f"Grouped file not found: {GROUPED_CSV}")
@@ -214,6 +344,7 @@ def main() -> None:
 
     concepts = load_grouped()
     candidates = build_candidates(concepts)
+    pools_by_pos = bucket_candidates(candidates)
 
     # Hard-only pool for fallback
     hard_candidates = []
@@ -222,8 +353,10 @@ def main() -> None:
         for w in data["hard"]:
             hard_candidates.append((w, pos, cid))
 
-    with RANDOM_SELECT_CSV.open("r", encoding="utf-8") as f_in, OUTPUT_CSV.open(
-        "w", newline="", encoding="utf-8"
+    with RANDOM_SELECT_CSV.open(
+        "r", buffering=READ_BUFFER_SIZE, encoding="utf-8"
+    ) as f_in, OUTPUT_CSV.open(
+        "w", buffering=WRITE_BUFFER_SIZE, newline="", encoding="utf-8"
     ) as f_out:
         reader = csv.DictReader(f_in)
         fieldnames = reader.fieldnames or []
@@ -236,29 +369,42 @@ def main() -> None:
         writer = csv.DictWriter(f_out, fieldnames=out_fieldnames)
         writer.writeheader()
 
-        for row in reader:
+        rows = list(reader)
+
+        # Select once per concept (rows sharing an ID reuse the same distractors),
+        # spreading concepts across worker processes; map keeps results ordered
+        cids = list(dict.fromkeys(
+            cid for cid in (row.get("ID", "").strip() for row in rows) if cid in concepts
+        ))
+        with ProcessPoolExecutor(
+            initializer=_init_worker, initargs=(concepts, pools_by_pos)
+        ) as executor:
+            picks_by_cid = dict(executor.map(_select_for_concept, cids, chunksize=WORKER_CHUNKSIZE))
+
+        batch: List[dict] = []
+
+        for row in rows:
+            if len(batch) >= WRITE_BATCH_ROWS:
+                writer.writerows(batch)
+                batch.clear()
+
             cid = row.get("ID", "").strip()
             concept = concepts.get(cid)
             if not concept:
                 # No concept info; write through
-                writer.writerow(row)
+                batch.append(row)
                 continue
 
-            pos = concept["pos"]
-            anchors = concept["all_words"]
-            picks = select_distractors(
-                anchors=anchors,
-                pos=pos,
-                cid=cid,
-                candidates=candidates,
-            )
+            picks = picks_by_cid[cid]
 
             # Fill the three distractor slots
             row["Easy_distractor"] = picks[0] if len(picks) > 0 else ""
             row["Medium_distractor"] = picks[1] if len(picks) > 1 else ""
             row["Hard_distractor"] = picks[2] if len(picks) > 2 else ""
 
-            writer.writerow(row)
+            batch.append(row)
+
+        writer.writerows(batch)
 
     print(f"Wrote: {OUTPUT_CSV}")
 
@@ -13,10 +13,32 @@ Output: 6 distractor columns (2 for easy, 2 for medium, 2 for hard targets)
 """
 
 import csv
+import itertools
+import os
 import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
 from collections import defaultdict
-from typing import Dict, List, Tuple
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    # C++ Levenshtein kernels; fall back to the pure-Python DP below if missing
+    from rapidfuzz import process as rf_process
+    from rapidfuzz.distance import Levenshtein
+except ImportError:
+    rf_process = None
+    Levenshtein = None
+
+try:
+    # JIT-compiles the DP for edit_distance when rapidfuzz is missing
+    from numba import njit
+except ImportError:
+    njit = None
 
 ROOT = Path(__file__).resolve().parent.parent
 RANDOM_SELECT_CSV = ROOT / "data" / "output" / "BASMA Plan - Random Select.csv"
@@ -24,12 +46,147 @@ ALL_WORDS_CSV = ROOT / "data" / "output" / "BASMA Plan - all_words.csv"
 CONCEPTS_GROUPED_CSV = ROOT / "data" / "output" / "BASMA Plan - Concepts Grouped.csv"
 OUTPUT_CSV = ROOT / "data" / "output" / "BASMA Plan - Random Select with Edit Distance Distractors.csv"
 
-# Use a fixed seed for reproducibility
-random.seed(42)
+# Fixed seed for reproducibility; each concept gets its own RNG derived from it
+SEED = 42
+# Concepts handed to each worker process at a time
+WORKER_CHUNKSIZE = 8
+# Chunks queued per worker process; bounds how much input is read ahead
+PENDING_CHUNKS_PER_WORKER = 4
+
+# Columns each loader reads; rows are indexed positionally by header position
+CONCEPT_WORDS_COLUMNS = ['ID', 'Easy', 'Medium', 'Hard']
+ALL_WORDS_COLUMNS = ['ID', 'CODA', 'EasinessCategory', 'POS']
+# Random select fields handed to process_concept, in this order
+RANDOM_SELECT_COLUMNS = ['ID', 'English', 'French', 'MSA', 'POS', 'Easy_target', 'Medium_target', 'Hard_target']
+
+# Read-only state broadcast to worker processes by _init_worker
+_worker_candidates: Dict[str, dict] = {}
+_worker_concept_words: Dict[int, Dict[str, List[str]]] = {}
+_worker_trees: Optional[Dict[str, "BKTree"]] = None
+# rapidfuzz cdist threads; a single thread inside worker processes, which
+# already run one per CPU
+_cdist_workers = -1
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _lev_codes(a, b, max_dist):
+        """Two-row Levenshtein DP over code-point arrays (max_dist < 0: unbounded)."""
+        if len(a) > len(b):
+            a, b = b, a
+        delta = len(b) - len(a)
+        if max_dist >= 0 and delta > max_dist:
+            return max_dist + 1
+        prev = np.arange(len(a) + 1, dtype=np.int32)
+        curr = np.empty(len(a) + 1, dtype=np.int32)
+        for j in range(1, len(b) + 1):
+            curr[0] = j
+            bj = b[j - 1]
+            for i in range(1, len(a) + 1):
+                best = prev[i - 1] if a[i - 1] == bj else prev[i - 1] + 1
+                if prev[i] + 1 < best:
+                    best = prev[i] + 1
+                if curr[i - 1] + 1 < best:
+                    best = curr[i - 1] + 1
+                curr[i] = best
+            if max_dist >= 0 and j >= delta and curr[j - delta] > max_dist:
+                return max_dist + 1
+            prev, curr = curr, prev
+        return prev[len(a)]
+else:
+    _lev_codes = None
+
+
+# Longest shorter string handled by the bit-parallel path in edit_distance
+MYERS_MAX_LEN = 64
+
+# Exact distances already computed in Python; the same pairs recur across
+# BK-tree searches and across the three levels of a concept. Kept small
+# (about 1.5MB), as each worker process holds its own copy
+DISTANCE_CACHE_SIZE = 1 << 14
+_distance_cache: Dict[Tuple[str, str], int] = {}
+
+
+@lru_cache(maxsize=4096)
+def _build_peq(pattern: str) -> Dict[str, int]:
+    """Bitmask of the positions of each character in `pattern` (Myers' Peq)."""
+    peq: Dict[str, int] = {}
+    for i, ch in enumerate(pattern):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+    return peq
+
+
+def _myers_distance(pattern: str, text: str, max_dist: Optional[int] = None) -> int:
+    """
+    Levenshtein distance by Myers' bit-parallel algorithm (Hyyrö's global
+    variant): one column of the DP per character of `text`, held as bitvectors
+    of vertical +1/-1 deltas. `pattern` must be non-empty.
+    """
+    peq = _build_peq(pattern)
+    m = len(pattern)
+    mask = (1 << m) - 1
+    last = 1 << (m - 1)
+    pv, mv, score = mask, 0, m
+    remaining = len(text)
+    for ch in text:
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        # Each remaining column can lower the score by at most one
+        remaining -= 1
+        if max_dist is not None and score - remaining > max_dist:
+            return max_dist + 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+    return score
 
 
-def edit_distance(a: str, b: str) -> int:
-    """Compute Levenshtein distance (iterative DP)."""
+@lru_cache(maxsize=None)
+def _code_points(word: str) -> np.ndarray:
+    """A word as a uint32 code-point array for _lev_codes (encoded once per word)."""
+    return np.frombuffer(word.encode("utf-32-le"), dtype=np.uint32)
+
+
+def edit_distance(a: str, b: str, max_dist: Optional[int] = None) -> int:
+    """
+    Compute Levenshtein distance (rapidfuzz if installed, else a numba-compiled
+    DP if numba is, else Myers' bit-parallel algorithm in Python, or an
+    iterative DP for words longer than MYERS_MAX_LEN).
+    With `max_dist`, any distance above it is reported as max_dist + 1, so
+    clearly distant pairs exit before (or part way through) the DP.
+    """
+    if Levenshtein is not None:
+        return Levenshtein.distance(a, b, score_cutoff=max_dist)
+    if _lev_codes is not None:
+        return int(_lev_codes(_code_points(a), _code_points(b), -1 if max_dist is None else max_dist))
+    # The distance is symmetric, so order the pair to share one cache entry
+    if a > b:
+        a, b = b, a
+    dist = _distance_cache.get((a, b))
+    if dist is None:
+        dist = _python_distance(a, b, max_dist)
+        if max_dist is not None and dist > max_dist:
+            # Only a lower bound; not cached
+            return dist
+        if len(_distance_cache) >= DISTANCE_CACHE_SIZE:
+            _distance_cache.clear()
+        _distance_cache[(a, b)] = dist
+    return dist if max_dist is None or dist <= max_dist else max_dist + 1
+
+
+def _python_distance(a: str, b: str, max_dist: Optional[int]) -> int:
+    """edit_distance in pure Python (Myers, or the DP for long words)."""
+    if max_dist is not None and abs(len(a) - len(b)) > max_dist:
+        # The length difference alone is a lower bound on the distance
+        return max_dist + 1
     if a == b:
         return 0
     if not a:
@@ -40,28 +197,171 @@ def edit_distance(a: str, b: str) -> int:
     # Ensure a is the shorter string
     if len(a) > len(b):
         a, b = b, a
+    if len(a) <= MYERS_MAX_LEN:
+        return _myers_distance(a, b, max_dist)
 
+    # Cells on the diagonal that ends at the result never decrease along it,
+    # so the DP can stop as soon as that diagonal passes max_dist
+    delta = len(b) - len(a)
+    # Two preallocated rows, swapped each pass instead of rebuilt; the
+    # diagonal and left cells are carried in locals
     prev = list(range(len(a) + 1))
+    curr = [0] * (len(a) + 1)
     for j, bj in enumerate(b, start=1):
-        curr = [j]
+        curr[0] = left = j
+        diag = j - 1
         for i, ai in enumerate(a, start=1):
-            cost = 0 if ai == bj else 1
-            curr.append(
-                min(
-                    prev[i] + 1,      # deletion
-                    curr[i - 1] + 1,  # insertion
-                    prev[i - 1] + cost,  # substitution
-                )
-            )
-        prev = curr
+            up = prev[i]
+            best = diag if ai == bj else diag + 1  # substitution
+            if up + 1 < best:
+                best = up + 1    # deletion
+            if left + 1 < best:
+                best = left + 1  # insertion
+            curr[i] = left = best
+            diag = up
+        if max_dist is not None and j >= delta and curr[j - delta] > max_dist:
+            return max_dist + 1
+        prev, curr = curr, prev
     return prev[-1]
 
 
+def edit_distance_matrix(target_words: List[str], candidates: List[str]) -> np.ndarray:
+    """(targets x candidates) matrix of edit distances."""
+    if rf_process is not None:
+        # A distance is at most the longer word's length; uint8 keeps the
+        # matrix small but would wrap past 255, so long words get int32
+        longest = max(map(len, itertools.chain(target_words, candidates)), default=0)
+        # Computed in C in one call
+        return rf_process.cdist(
+            target_words,
+            candidates,
+            scorer=Levenshtein.distance,
+            dtype=np.uint8 if longest <= np.iinfo(np.uint8).max else np.int32,
+            workers=_cdist_workers,
+        )
+    return np.array(
+        [[edit_distance(tw, coda) for coda in candidates] for tw in target_words],
+        dtype=np.int32,
+    ).reshape(len(target_words), len(candidates))
+
+
+class BKTree:
+    """
+    Burkhard-Keller tree over a list of words under edit distance. Each node
+    is [word, entry indices, children, largest child key]: one distinct word,
+    every entry spelled that way, and children keyed by their distance to it.
+    """
+
+    def __init__(self, words: List[str]):
+        self.root = None
+        for index, word in enumerate(words):
+            self.add(word, index)
+
+    def add(self, word: str, index: int):
+        """Insert `word` (entry `index`), sharing the node of an identical word."""
+        if self.root is None:
+            self.root = [word, [index], {}, 0]
+            return
+        node = self.root
+        while True:
+            dist = edit_distance(word, node[0])
+            if dist == 0:
+                node[1].append(index)
+                return
+            child = node[2].get(dist)
+            if child is None:
+                node[2][dist] = [word, [index], {}, 0]
+                node[3] = max(node[3], dist)
+                return
+            node = child
+
+    def find(self, word: str, radius: int) -> Iterator[int]:
+        """Yield the index of every entry within `radius` edits of `word`."""
+        if self.root is None:
+            return
+        stack = [self.root]
+        while stack:
+            node_word, indices, children, max_child_dist = stack.pop()
+            # Past radius + the largest child key neither the node nor any
+            # child can match, so the exact distance is not needed
+            dist = edit_distance(word, node_word, radius + max_child_dist)
+            if dist <= radius:
+                yield from indices
+            # Triangle inequality: only subtrees at dist +/- radius can match
+            for child_dist, child in children.items():
+                if dist - radius <= child_dist <= dist + radius:
+                    stack.append(child)
+
+
+def build_bk_trees(all_candidates: Dict[str, dict]) -> Dict[str, BKTree]:
+    """One BK-tree per POS bucket, indexing entries by their position in the bucket."""
+    return {
+        pos: BKTree(bucket['coda'].tolist())
+        for pos, bucket in all_candidates.items()
+    }
+
+
+def groups_by_matrix(min_dists: np.ndarray, candidates: List[str]) -> Iterator[List[str]]:
+    """
+    Yield candidates grouped by their minimum distance to the target words
+    (`min_dists`, one per candidate, taken from a distance matrix), nearest
+    first; candidate order is kept within a group.
+    """
+    min_dists = min_dists.astype(np.int32)
+    
+    # Peel off the nearest group one pass at a time instead of sorting
+    # everything; callers usually stop after the first group or two
+    done = np.iinfo(np.int32).max
+    while True:
+        dist = min_dists.min()
+        if dist == done:
+            return
+        at_dist = np.flatnonzero(min_dists == dist)
+        min_dists[at_dist] = done
+        yield [candidates[i] for i in at_dist]
+
+
+def groups_by_tree(
+    target_words: List[str],
+    tree: BKTree,
+    codas: np.ndarray,
+    keep: np.ndarray,
+) -> Iterator[List[str]]:
+    """
+    Same grouping as groups_by_matrix, found lazily with an expanding-radius
+    BK-tree search over `codas` (restricted to those flagged in `keep`), so
+    only the nearest ranks that are actually needed get searched.
+    """
+    remaining = int(keep.sum())
+    seen = set()
+    radius = 0
+    while remaining:
+        found = {
+            i for tw in target_words for i in tree.find(tw, radius)
+            if keep[i] and i not in seen
+        }
+        if found:
+            seen.update(found)
+            remaining -= len(found)
+            yield [codas[i] for i in sorted(found)]
+        radius += 1
+
+
 def strip_whitespace(s: str) -> str:
     """Strip whitespace from string."""
     return s.strip() if s else ""
 
 
+def read_header(reader, path: Path, columns: List[str]) -> Dict[str, int]:
+    """Read the header row of `reader` and map each column name to its position."""
+    header = next(reader, [])
+    idx = {name: i for i, name in enumerate(header)}
+    missing = [col for col in columns if col not in idx]
+    if missing:
+        raise SystemExit(f"{path.name} is missing columns: {', '.join(missing)}")
+    return idx
+
+
 def load_concept_words() -> Dict[int, Dict[str, List[str]]]:
     """
     Load ALL easy/medium/hard words for each concept from Concepts Grouped.
@@ -70,9 +370,13 @@ def load_concept_words() -> Dict[int, Dict[str, List[str]]]:
     concept_words = {}
     
     with CONCEPTS_GROUPED_CSV.open('r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
+        reader = csv.reader(f)
+        idx = read_header(reader, CONCEPTS_GROUPED_CSV, CONCEPT_WORDS_COLUMNS)
+        id_i, easy_i, medium_i, hard_i = (idx[col] for col in CONCEPT_WORDS_COLUMNS)
         for row in reader:
-            cid = row.get('ID', '').strip()
+            if not row:
+                continue
+            cid = row[id_i].strip()
             if not cid:
                 continue
             try:
@@ -82,19 +386,19 @@ def load_concept_words() -> Dict[int, Dict[str, List[str]]]:
             
             # Get all easy words
             easy_words = []
-            easy = row.get('Easy', '').strip()
+            easy = row[easy_i].strip()
             if easy:
                 easy_words = [w.strip() for w in easy.split('|') if w.strip()]
             
             # Get all medium words
             medium_words = []
-            medium = row.get('Medium', '').strip()
+            medium = row[medium_i].strip()
             if medium:
                 medium_words = [w.strip() for w in medium.split('|') if w.strip()]
             
             # Get all hard words
             hard_words = []
-            hard = row.get('Hard', '').strip()
+            hard = row[hard_i].strip()
             if hard:
                 hard_words = [w.strip() for w in hard.split('|') if w.strip()]
             
@@ -107,7 +411,7 @@ def load_concept_words() -> Dict[int, Dict[str, List[str]]]:
     return concept_words
 
 
-def load_all_words() -> Dict[int, List[Tuple[str, str, str]]]:
+def load_all_words() -> Dict[str, dict]:
     """
     Load ALL medium and hard words from all_words.csv.
     
@@ -115,19 +419,28 @@ def load_all_words() -> Dict[int, List[Tuple[str, str, str]]]:
     random select file. Includes medium/hard words even if the concept doesn't 
     have all three difficulty levels.
     
-    Returns: dict mapping concept ID to list of (CODA, EasinessCategory, POS) tuples
+    Returns: dict mapping POS to a bucket of parallel arrays:
+    - 'concept_id': int32 concept ID of each entry
+    - 'coda': CODA of each entry (object array)
+    - 'lower_index': lowercased CODA -> positions of the entries spelled that way
+    Entries are grouped by concept in first-seen order so candidates at the
+    same distance are shuffled in a stable order.
     Only includes Medium and Hard words.
     """
-    candidates = defaultdict(list)
+    by_concept = defaultdict(list)
     
     with ALL_WORDS_CSV.open('r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
+        reader = csv.reader(f)
+        idx = read_header(reader, ALL_WORDS_CSV, ALL_WORDS_COLUMNS)
+        id_i, coda_i, category_i, pos_i = (idx[col] for col in ALL_WORDS_COLUMNS)
         for row in reader:
-            coda = strip_whitespace(row.get('CODA', ''))
+            if not row:
+                continue
+            coda = strip_whitespace(row[coda_i])
             if not coda:
                 continue
             
-            cid = row.get('ID', '').strip()
+            cid = row[id_i].strip()
             if not cid:
                 continue
             try:
@@ -135,118 +448,245 @@ def load_all_words() -> Dict[int, List[Tuple[str, str, str]]]:
             except ValueError:
                 continue
             
-            category = row.get('EasinessCategory', '').strip()
-            pos = row.get('POS', '').strip()
+            category = row[category_i].strip()
+            pos = row[pos_i].strip()
             # Only include Medium and Hard words from ALL concepts
             # (not filtered by whether concept is in random select file)
             if category in ('Medium', 'Hard'):
-                candidates[concept_id].append((coda, category, pos))
+                by_concept[concept_id].append((pos, coda))
+    
+    by_pos = defaultdict(list)
+    for concept_id, words in by_concept.items():
+        for pos, coda in words:
+            by_pos[pos].append((concept_id, coda))
+    
+    buckets = {}
+    for pos, entries in by_pos.items():
+        lower_index = defaultdict(list)
+        for i, (_, coda) in enumerate(entries):
+            lower_index[coda.lower()].append(i)
+        buckets[pos] = {
+            'concept_id': np.array([concept_id for concept_id, _ in entries], dtype=np.int32),
+            'coda': np.array([coda for _, coda in entries], dtype=object),
+            'lower_index': {w: np.array(idx) for w, idx in lower_index.items()},
+        }
+    return buckets
+
+
+def pick_by_rank(groups: Iterator[List[str]], k: int, rng: random.Random) -> List[str]:
+    """
+    Pick k words from distance groups, nearest first: if a group has more
+    than needed pick randomly from it, otherwise take it all and move on to
+    the next rank.
+    """
+    picks = []
+    for candidates_at_dist in groups:
+        # Remove duplicates while preserving order
+        unique_candidates = list(dict.fromkeys(candidates_at_dist))
+        
+        needed = k - len(picks)
+        if len(unique_candidates) >= needed:
+            # Pick randomly from candidates at this distance
+            rng.shuffle(unique_candidates)
+            picks.extend(unique_candidates[:needed])
+            # Filled: stop before the next distance group is computed
+            break
+        # Take all candidates at this distance and continue to next rank
+        picks.extend(unique_candidates)
     
-    return dict(candidates)
+    return picks[:k]
 
 
 def select_distractors_by_edit_distance(
-    target_words: List[str],
+    level_targets: List[List[str]],
     target_pos: str,
     exclude_concept_id: int,
-    all_candidates: Dict[int, List[Tuple[str, str, str]]],
-    exclude_words: List[str],
-    already_selected: List[str],
-    k: int = 2
-) -> List[str]:
+    all_candidates: Dict[str, dict],
+    exclude_words: FrozenSet[str],
+    rng: random.Random,
+    k: int = 2,
+    trees: Optional[Dict[str, BKTree]] = None,
+) -> List[List[str]]:
     """
-    Select k distractors based on edit distance.
+    Select k distractors based on edit distance for each list of target
+    words in `level_targets` (one per level), in order.
     
     - Compute edit distance from each target_word to all medium/hard words
-    - Use minimum distance across all target words
+      (`all_candidates` from `load_all_words`, bucketed by POS)
+    - Use minimum distance across all target words of the level
     - Only include candidates with the same POS as target
     - Exclude words from the same concept (all easy/medium/hard words from that concept)
-    - Exclude words already selected as distractors for this concept
-    - Group by edit distance
+    - Exclude words already selected as distractors for an earlier level
+    - Group by edit distance (via the POS's BK-tree if `trees` is given,
+      else from one distance matrix over the targets of every level)
     - Pick k distractors: start with lowest distance, if multiple at same 
       distance pick randomly, if only 1 pick it and move to next rank
     """
-    if not target_words:
-        return []
+    no_picks = [[] for _ in level_targets]
+    if k <= 0:
+        return no_picks
     
     # Strip and filter target words
-    target_words = [strip_whitespace(w) for w in target_words if strip_whitespace(w)]
-    if not target_words:
-        return []
+    level_targets = [[strip_whitespace(w) for w in words if strip_whitespace(w)] for words in level_targets]
     
     target_pos = strip_whitespace(target_pos)
     if not target_pos:
-        return []
+        return no_picks
     
-    # Create set of excluded words for fast lookup
-    exclude_set = set(w.strip().lower() if w else "" for w in exclude_words)
-    for tw in target_words:
-        exclude_set.add(tw.lower())
+    # Same-POS candidates from other concepts, minus this concept's words;
+    # shared by every level
+    bucket = all_candidates.get(target_pos)
+    if bucket is None:
+        return no_picks
+    lower_index = bucket['lower_index']
+    base_keep = bucket['concept_id'] != exclude_concept_id
+    for w in exclude_words:
+        excluded = lower_index.get(w)
+        if excluded is not None:
+            base_keep[excluded] = False
     
-    # Also exclude words already selected as distractors
-    already_selected_set = set(w.strip().lower() if w else "" for w in already_selected)
-    exclude_set.update(already_selected_set)
+    if trees is None:
+        # One matrix row per target word of any level; each level takes the
+        # minimum over its own rows
+        base_positions = np.flatnonzero(base_keep)
+        candidates = bucket['coda'][base_positions].tolist()
+        all_targets = [w for words in level_targets for w in words]
+        if candidates and all_targets:
+            dists = edit_distance_matrix(all_targets, candidates)
+        row_ends = np.cumsum([len(words) for words in level_targets])
     
-    # Compute edit distances to all candidates
-    # For each candidate, use minimum distance to any target word
-    distances = []
-    for concept_id, words in all_candidates.items():
-        if concept_id == exclude_concept_id:
-            continue  # Exclude same concept
+    picks_by_level = []
+    already_selected = []
+    for level, target_words in enumerate(level_targets):
+        if not target_words:
+            picks_by_level.append([])
+            continue
         
-        for coda, _, pos in words:
-            coda = strip_whitespace(coda)
-            if not coda:
-                continue
-            
-            # Only include candidates with the same POS
-            if strip_whitespace(pos) != target_pos:
-                continue
-            
-            # Exclude all words from the target concept (easy/medium/hard)
-            if coda.lower() in exclude_set:
+        # This level's targets and the distractors already picked are excluded too
+        keep = base_keep.copy()
+        for w in itertools.chain(target_words, already_selected):
+            excluded = lower_index.get(w.lower())
+            if excluded is not None:
+                keep[excluded] = False
+        
+        if trees is not None:
+            groups = groups_by_tree(target_words, trees[target_pos], bucket['coda'], keep)
+        else:
+            level_keep = keep[base_positions]
+            if not level_keep.any():
+                picks_by_level.append([])
                 continue
-            
-            # Compute minimum distance to any target word
-            min_dist = min(edit_distance(tw, coda) for tw in target_words)
-            distances.append((min_dist, coda))
+            rows = dists[row_ends[level] - len(target_words):row_ends[level]]
+            groups = groups_by_matrix(
+                rows[:, level_keep].min(axis=0),
+                [c for c, kept in zip(candidates, level_keep) if kept],
+            )
+        
+        picks = pick_by_rank(groups, k, rng)
+        picks_by_level.append(picks)
+        already_selected.extend(picks)
     
-    if not distances:
-        return []
+    return picks_by_level
+
+
+def _init_worker(
+    all_candidates: Dict[str, dict],
+    concept_words: Dict[int, Dict[str, List[str]]],
+    trees: Optional[Dict[str, BKTree]],
+) -> None:
+    """Store the shared read-only state once per worker process."""
+    global _worker_candidates, _worker_concept_words, _worker_trees, _cdist_workers
+    _worker_candidates = all_candidates
+    _worker_concept_words = concept_words
+    _worker_trees = trees
+    _cdist_workers = 1
+
+
+def process_chunk(chunk: List[Tuple[str, ...]]) -> List[Optional[Dict[str, str]]]:
+    """Worker entry point: process_concept for each row of a chunk."""
+    return [process_concept(fields) for fields in chunk]
+
+
+def process_concept(fields: Tuple[str, ...]) -> Optional[Dict[str, str]]:
+    """
+    Worker entry point: build the output row for one random-select row, given
+    its RANDOM_SELECT_COLUMNS values.
+    """
+    id_raw, english, french, msa_raw, pos_raw, easy_raw, medium_raw, hard_raw = fields
+    concept_id = id_raw.strip()
+    try:
+        cid = int(concept_id)
+    except ValueError:
+        print(f"Warning: Invalid ID '{concept_id}', skipping")
+        return None
     
-    # Group by edit distance
-    by_distance = defaultdict(list)
-    for dist, word in distances:
-        by_distance[dist].append(word)
+    # Each concept gets its own RNG, so picks do not depend on processing
+    # order or worker assignment
+    rng = random.Random(f"{SEED}:{cid}")
     
-    # Sort distances
-    sorted_distances = sorted(by_distance.keys())
+    # Get all words from this concept by level
+    concept_data = _worker_concept_words.get(cid, {'easy': [], 'medium': [], 'hard': []})
+    all_easy_words = concept_data.get('easy', [])
+    all_medium_words = concept_data.get('medium', [])
+    all_hard_words = concept_data.get('hard', [])
     
-    # Pick k distractors
-    picks = []
-    for dist in sorted_distances:
-        candidates_at_dist = by_distance[dist]
-        # Remove duplicates while preserving order
-        unique_candidates = []
-        seen = set()
-        for c in candidates_at_dist:
-            if c not in seen:
-                unique_candidates.append(c)
-                seen.add(c)
-        
-        needed = k - len(picks)
-        if needed <= 0:
-            break
-        
-        if len(unique_candidates) >= needed:
-            # Pick randomly from candidates at this distance
-            random.shuffle(unique_candidates)
-            picks.extend(unique_candidates[:needed])
-        else:
-            # Take all candidates at this distance and continue to next rank
-            picks.extend(unique_candidates)
+    # Get all words from this concept to exclude (all easy/medium/hard),
+    # lowercased once for all three levels
+    exclude_words = frozenset(
+        w.strip().lower() for w in all_easy_words + all_medium_words + all_hard_words
+    )
     
-    return picks[:k]
+    # Get the selected targets for display (from random select file)
+    easy_target = strip_whitespace(easy_raw)
+    medium_target = strip_whitespace(medium_raw)
+    hard_target = strip_whitespace(hard_raw)
+    
+    # Get MSA for this concept (to include in easy distractor comparison)
+    msa = strip_whitespace(msa_raw)
+    # MSA might have multiple words separated by "،" - split and clean
+    msa_words = []
+    if msa:
+        # Split by Arabic comma and clean
+        for msa_part in msa.split('،'):
+            msa_clean = strip_whitespace(msa_part)
+            if msa_clean:
+                msa_words.append(msa_clean)
+    
+    # Get POS for this concept
+    target_pos = strip_whitespace(pos_raw)
+    
+    # For easy distractors: include MSA words as additional targets for edit distance
+    # For medium/hard: use only dialectal words
+    easy_target_words = all_easy_words + msa_words
+    
+    # Select 2 distractors for each level using ALL words from that level
+    # Only candidates with the same POS will be considered
+    # Easy distractors also compare against MSA
+    # Levels are picked in order so all 6 distractors are unique
+    easy_distractors, medium_distractors, hard_distractors = select_distractors_by_edit_distance(
+        [easy_target_words, all_medium_words, all_hard_words],
+        target_pos, cid, _worker_candidates, exclude_words, rng,
+        k=2, trees=_worker_trees,
+    )
+    
+    # Create output row
+    output_row = {
+        'ID': id_raw,
+        'English': english,
+        'French': french,
+        'MSA': msa_raw,
+        'POS': pos_raw,
+        'Easy_target': easy_target,
+        'Medium_target': medium_target,
+        'Hard_target': hard_target,
+        'Easy_distractor_1': easy_distractors[0] if len(easy_distractors) > 0 else '',
+        'Easy_distractor_2': easy_distractors[1] if len(easy_distractors) > 1 else '',
+        'Medium_distractor_1': medium_distractors[0] if len(medium_distractors) > 0 else '',
+        'Medium_distractor_2': medium_distractors[1] if len(medium_distractors) > 1 else '',
+        'Hard_distractor_1': hard_distractors[0] if len(hard_distractors) > 0 else '',
+        'Hard_distractor_2': hard_distractors[1] if len(hard_distractors) > 1 else '',
+    }
+    return output_row
 
 
 def main():
@@ -254,106 +694,17 @@ def main():
     # Load all medium and hard words
     print("Loading candidates from all_words.csv...")
     all_candidates = load_all_words()
-    print(f"Loaded {sum(len(words) for words in all_candidates.values())} medium/hard words from {len(all_candidates)} concepts")
+    # Without rapidfuzz each distance is a Python DP, so index the candidates
+    # in BK-trees to search only the nearest ranks instead of all of them
+    trees = build_bk_trees(all_candidates) if rf_process is None else None
+    n_concepts = len(set().union(*(bucket['concept_id'].tolist() for bucket in all_candidates.values())))
+    print(f"Loaded {sum(len(bucket['coda']) for bucket in all_candidates.values())} medium/hard words from {n_concepts} concepts")
     
     # Load all words for each concept (to exclude all easy/medium/hard from target concept)
     print("Loading concept words from Concepts Grouped...")
     concept_words = load_concept_words()
     print(f"Loaded words for {len(concept_words)} concepts")
     
-    # Load random select concepts
-    print("Loading target concepts...")
-    target_concepts = []
-    with RANDOM_SELECT_CSV.open('r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            target_concepts.append(row)
-    
-    print(f"Processing {len(target_concepts)} concepts...")
-    
-    # Process each concept
-    output_rows = []
-    for row in target_concepts:
-        concept_id = row.get('ID', '').strip()
-        try:
-            cid = int(concept_id)
-        except ValueError:
-            print(f"Warning: Invalid ID '{concept_id}', skipping")
-            continue
-        
-        # Get all words from this concept by level
-        concept_data = concept_words.get(cid, {'easy': [], 'medium': [], 'hard': []})
-        all_easy_words = concept_data.get('easy', [])
-        all_medium_words = concept_data.get('medium', [])
-        all_hard_words = concept_data.get('hard', [])
-        
-        # Get all words from this concept to exclude (all easy/medium/hard)
-        exclude_words = all_easy_words + all_medium_words + all_hard_words
-        
-        # Get the selected targets for display (from random select file)
-        easy_target = strip_whitespace(row.get('Easy_target', ''))
-        medium_target = strip_whitespace(row.get('Medium_target', ''))
-        hard_target = strip_whitespace(row.get('Hard_target', ''))
-        
-        # Get MSA for this concept (to include in easy distractor comparison)
-        msa = strip_whitespace(row.get('MSA', ''))
-        # MSA might have multiple words separated by "،" - split and clean
-        msa_words = []
-        if msa:
-            # Split by Arabic comma and clean
-            for msa_part in msa.split('،'):
-                msa_clean = strip_whitespace(msa_part)
-                if msa_clean:
-                    msa_words.append(msa_clean)
-        
-        # Get POS for this concept
-        target_pos = strip_whitespace(row.get('POS', ''))
-        
-        # For easy distractors: include MSA words as additional targets for edit distance
-        # For medium/hard: use only dialectal words
-        easy_target_words = all_easy_words + msa_words
-        
-        # Select 2 distractors for each level using ALL words from that level
-        # Only candidates with the same POS will be considered
-        # Easy distractors also compare against MSA
-        # Track already selected distractors to ensure uniqueness across all 6
-        already_selected = []
-        
-        easy_distractors = select_distractors_by_edit_distance(
-            easy_target_words, target_pos, cid, all_candidates, exclude_words, already_selected, k=2
-        )
-        already_selected.extend(easy_distractors)
-        
-        medium_distractors = select_distractors_by_edit_distance(
-            all_medium_words, target_pos, cid, all_candidates, exclude_words, already_selected, k=2
-        )
-        already_selected.extend(medium_distractors)
-        
-        hard_distractors = select_distractors_by_edit_distance(
-            all_hard_words, target_pos, cid, all_candidates, exclude_words, already_selected, k=2
-        )
-        
-        # Create output row
-        output_row = {
-            'ID': row.get('ID', ''),
-            'English': row.get('English', ''),
-            'French': row.get('French', ''),
-            'MSA': row.get('MSA', ''),
-            'POS': row.get('POS', ''),
-            'Easy_target': easy_target,
-            'Medium_target': medium_target,
-            'Hard_target': hard_target,
-            'Easy_distractor_1': easy_distractors[0] if len(easy_distractors) > 0 else '',
-            'Easy_distractor_2': easy_distractors[1] if len(easy_distractors) > 1 else '',
-            'Medium_distractor_1': medium_distractors[0] if len(medium_distractors) > 0 else '',
-            'Medium_distractor_2': medium_distractors[1] if len(medium_distractors) > 1 else '',
-            'Hard_distractor_1': hard_distractors[0] if len(hard_distractors) > 0 else '',
-            'Hard_distractor_2': hard_distractors[1] if len(hard_distractors) > 1 else '',
-        }
-        output_rows.append(output_row)
-    
-    # Write output
-    print(f"Writing output to {OUTPUT_CSV}...")
     fieldnames = [
         'ID', 'English', 'French', 'MSA', 'POS',
         'Easy_target', 'Medium_target', 'Hard_target',
@@ -362,12 +713,39 @@ def main():
         'Hard_distractor_1', 'Hard_distractor_2'
     ]
     
-    with OUTPUT_CSV.open('w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
+    # Stream random select concepts through the workers in chunks, keeping
+    # only a bounded window of chunks in flight, and write the output rows
+    # in input order as each oldest chunk finishes
+    print("Processing target concepts...")
+    n_written = 0
+    with RANDOM_SELECT_CSV.open('r', encoding='utf-8') as f_in, \
+            OUTPUT_CSV.open('w', newline='', encoding='utf-8') as f_out, \
+            ProcessPoolExecutor(
+                initializer=_init_worker, initargs=(all_candidates, concept_words, trees)
+            ) as executor:
+        writer = csv.DictWriter(f_out, fieldnames=fieldnames)
         writer.writeheader()
-        writer.writerows(output_rows)
+        reader = csv.reader(f_in)
+        idx = read_header(reader, RANDOM_SELECT_CSV, RANDOM_SELECT_COLUMNS)
+        # Workers get plain tuples of the needed fields rather than whole rows
+        fields = itemgetter(*(idx[col] for col in RANDOM_SELECT_COLUMNS))
+        rows = (fields(row) for row in reader if row)
+        max_pending = PENDING_CHUNKS_PER_WORKER * (os.cpu_count() or 1)
+        pending = deque()
+        while True:
+            chunk = list(itertools.islice(rows, WORKER_CHUNKSIZE))
+            if chunk:
+                pending.append(executor.submit(process_chunk, chunk))
+            if not pending:
+                break
+            if chunk and len(pending) < max_pending:
+                continue
+            for output_row in pending.popleft().result():
+                if output_row is not None:
+                    writer.writerow(output_row)
+                    n_written += 1
     
-    print(f"Wrote {len(output_rows)} rows to {OUTPUT_CSV}")
+    print(f"Wrote {n_written} rows to {OUTPUT_CSV}")
 
 
 if __name__ == '__main__':
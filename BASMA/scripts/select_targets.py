@@ -10,6 +10,12 @@ DEFAULT_CONFIG = Path(__file__).parent / 'config.json'
 
 LEVEL_ORDER = {'H': 3, 'M': 2, 'L': 1, '': 0}
 
+# Columns read from the easiness file
+EASINESS_COLUMNS = [
+    'ID', 'English', 'French', 'MSA', 'POS', 'CODA', 'Region',
+    'DFreqLevel', 'DComLevel', 'EasinessScore', 'EasinessCategory',
+]
+
 
 def load_config(config_path: Path) -> dict:
     """Load configuration from JSON file."""
@@ -27,29 +33,31 @@ def parse_int_safe(value: str) -> Optional[int]:
         return None
 
 
-def score_tuple(row: Dict[str, str]) -> Tuple[int, int, int]:
+def score_tuple(row: List[str], idx: Dict[str, int]) -> Tuple[int, int, int]:
     # Primary: EasinessScore (higher is better for all categories)
-    score = parse_int_safe(row.get('EasinessScore', '')) or -1
+    score = parse_int_safe(row[idx['EasinessScore']]) or -1
     # Tie-breakers: DComLevel (H>M>L), then DFreqLevel (H>M>L)
-    dcom = LEVEL_ORDER.get(row.get('DComLevel', ''), 0)
-    dfreq = LEVEL_ORDER.get(row.get('DFreqLevel', ''), 0)
+    dcom = LEVEL_ORDER.get(row[idx['DComLevel']], 0)
+    dfreq = LEVEL_ORDER.get(row[idx['DFreqLevel']], 0)
     return (score, dcom, dfreq)
 
 
-def pick_best(rows: List[Dict[str, str]]) -> Optional[Dict[str, str]]:
+def pick_best(rows: List[List[str]], idx: Dict[str, int]) -> Optional[List[str]]:
     if not rows:
         return None
-    return max(rows, key=score_tuple)
-
-
-def main():
-    parser = argparse.ArgumentParser(description='Select best Easy/Medium/Hard words per concept')
-    parser.add_argument('--config', type=str, default=str(DEFAULT_CONFIG),
-                       help='Path to configuration file')
-    args = parser.parse_args()
-    
-    # Load config
-    config = load_config(Path(args.config))
+    return max(rows, key=lambda row: score_tuple(row, idx))
+
+
+def main(argv: Optional[List[str]] = None, config: Optional[dict] = None):
+    # An already-loaded config (e.g. from run_pipeline) skips argument parsing
+    if config is None:
+        parser = argparse.ArgumentParser(description='Select best Easy/Medium/Hard words per concept')
+        parser.add_argument('--config', type=str, default=str(DEFAULT_CONFIG),
+                           help='Path to configuration file')
+        args = parser.parse_args(argv)
+        
+        # Load config
+        config = load_config(Path(args.config))
     
     # Get file paths from config
     root = Path(__file__).parent
@@ -59,45 +67,49 @@ def main():
     if not easiness_csv.exists():
         raise SystemExit(f"Easiness file not found: {easiness_csv}")
 
-    by_id: Dict[str, List[Dict[str, str]]] = {}
+    by_id: Dict[str, List[List[str]]] = {}
     with easiness_csv.open('r', newline='', encoding='utf-8') as f_in:
-        reader = csv.DictReader(f_in)
+        reader = csv.reader(f_in)
+        header = next(reader, [])
+        # Resolve column positions once; rows are indexed positionally below
+        idx = {name: i for i, name in enumerate(header)}
+        missing = [col for col in EASINESS_COLUMNS if col not in idx]
+        if missing:
+            raise SystemExit(f"Easiness file is missing columns: {', '.join(missing)}")
+        id_i = idx['ID']
         for row in reader:
-            by_id.setdefault(row.get('ID', ''), []).append(row)
+            if not row:
+                continue
+            by_id.setdefault(row[id_i], []).append(row)
+
+    cat_i = idx['EasinessCategory']
+    english_i, french_i, msa_i, pos_i = idx['English'], idx['French'], idx['MSA'], idx['POS']
+    coda_i, region_i, score_i = idx['CODA'], idx['Region'], idx['EasinessScore']
 
-    out_rows: List[Dict[str, str]] = []
+    out_rows: List[List[str]] = []
 
     for concept_id, rows in by_id.items():
         # Partition by category
-        easy_rows = [r for r in rows if r.get('EasinessCategory') == 'Easy']
-        med_rows = [r for r in rows if r.get('EasinessCategory') == 'Medium']
-        hard_rows = [r for r in rows if r.get('EasinessCategory') == 'Hard']
+        easy_rows = [r for r in rows if r[cat_i] == 'Easy']
+        med_rows = [r for r in rows if r[cat_i] == 'Medium']
+        hard_rows = [r for r in rows if r[cat_i] == 'Hard']
 
-        best_easy = pick_best(easy_rows)
-        best_med = pick_best(med_rows)
-        best_hard = pick_best(hard_rows)
+        best_easy = pick_best(easy_rows, idx)
+        best_med = pick_best(med_rows, idx)
+        best_hard = pick_best(hard_rows, idx)
 
         if not (best_easy and best_med and best_hard):
             continue  # only keep IDs that have all three
 
         # Use shared concept metadata from any row (prefer easy row)
         meta = best_easy
-        out_rows.append({
-            'ID': concept_id,
-            'English': meta.get('English', ''),
-            'French': meta.get('French', ''),
-            'MSA': meta.get('MSA', ''),
-            'POS': meta.get('POS', ''),
-            'EasyCODA': best_easy.get('CODA', ''),
-            'EasyRegion': best_easy.get('Region', ''),
-            'EasyEasinessScore': best_easy.get('EasinessScore', ''),
-            'MediumCODA': best_med.get('CODA', ''),
-            'MediumRegion': best_med.get('Region', ''),
-            'MediumEasinessScore': best_med.get('EasinessScore', ''),
-            'HardCODA': best_hard.get('CODA', ''),
-            'HardRegion': best_hard.get('Region', ''),
-            'HardEasinessScore': best_hard.get('EasinessScore', ''),
-        })
+        out_rows.append([
+            concept_id,
+            meta[english_i], meta[french_i], meta[msa_i], meta[pos_i],
+            best_easy[coda_i], best_easy[region_i], best_easy[score_i],
+            best_med[coda_i], best_med[region_i], best_med[score_i],
+            best_hard[coda_i], best_hard[region_i], best_hard[score_i],
+        ])
 
     fieldnames = [
         'ID', 'English', 'French', 'MSA', 'POS',
@@ -107,10 +119,9 @@ def main():
     ]
 
     with output_csv.open('w', newline='', encoding='utf-8') as f_out:
-        writer = csv.DictWriter(f_out, fieldnames=fieldnames)
-        writer.writeheader()
-        for r in sorted(out_rows, key=lambda x: int(x['ID'])):
-            writer.writerow(r)
+        writer = csv.writer(f_out)
+        writer.writerow(fieldnames)
+        writer.writerows(sorted(out_rows, key=lambda x: int(x[0])))
 
     print(f"Wrote: {output_csv} with {len(out_rows)} IDs")
 
@@ -4,12 +4,20 @@ import csv
 import json
 import argparse
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set
 
 DEFAULT_CONFIG = Path(__file__).parent / 'config.json'
 
 CATEGORIES = {'Easy', 'Medium', 'Hard'}
 
+# Output columns, in order; all but 'Category' are copied from the easiness file
+FIELDNAMES = [
+    'ID', 'English', 'French', 'MSA', 'POS',
+    'Category', 'CODA', 'Region',
+    'ASimLevel', 'FSimLevel', 'DFreqLevel', 'DComLevel',
+    'EasinessScore',
+]
+
 
 def load_config(config_path: Path) -> dict:
     """Load configuration from JSON file."""
@@ -20,14 +28,16 @@ def load_config(config_path: Path) -> dict:
         return json.load(f)
 
 
-def main():
-    parser = argparse.ArgumentParser(description='Generate long-form files with all words by category')
-    parser.add_argument('--config', type=str, default=str(DEFAULT_CONFIG),
-                       help='Path to configuration file')
-    args = parser.parse_args()
-    
-    # Load config
-    config = load_config(Path(args.config))
+def main(argv: Optional[List[str]] = None, config: Optional[dict] = None):
+    # An already-loaded config (e.g. from run_pipeline) skips argument parsing
+    if config is None:
+        parser = argparse.ArgumentParser(description='Generate long-form files with all words by category')
+        parser.add_argument('--config', type=str, default=str(DEFAULT_CONFIG),
+                           help='Path to configuration file')
+        args = parser.parse_args(argv)
+        
+        # Load config
+        config = load_config(Path(args.config))
     
     # Get file paths from config
     root = Path(__file__).parent
@@ -38,56 +48,43 @@ def main():
     if not easiness_csv.exists():
         raise SystemExit(f"Easiness file not found: {easiness_csv}")
 
-    rows = []
+    rows: List[List[str]] = []
     by_id_to_cats: Dict[str, Set[str]] = {}
 
     with easiness_csv.open('r', newline='', encoding='utf-8') as f_in:
-        reader = csv.DictReader(f_in)
+        reader = csv.reader(f_in)
+        header = next(reader, [])
+        # Resolve column positions once; rows are indexed positionally below
+        idx = {name: i for i, name in enumerate(header)}
+        source_cols = ['EasinessCategory' if col == 'Category' else col for col in FIELDNAMES]
+        missing = [col for col in source_cols if col not in idx]
+        if missing:
+            raise SystemExit(f"Easiness file is missing columns: {', '.join(missing)}")
+        col_idx = [idx[col] for col in source_cols]
+        id_i = idx['ID']
+        cat_i = idx['EasinessCategory']
         for r in reader:
-            cat = r.get('EasinessCategory', '')
+            if not r:
+                continue
+            cat = r[cat_i]
             if cat not in CATEGORIES:
                 continue
-            concept_id = r.get('ID', '')
-            by_id_to_cats.setdefault(concept_id, set()).add(cat)
-            rows.append({
-                'ID': concept_id,
-                'English': r.get('English', ''),
-                'French': r.get('French', ''),
-                'MSA': r.get('MSA', ''),
-                'POS': r.get('POS', ''),
-                'Category': cat,
-                'CODA': r.get('CODA', ''),
-                'Region': r.get('Region', ''),
-                'ASimLevel': r.get('ASimLevel', ''),
-                'FSimLevel': r.get('FSimLevel', ''),
-                'DFreqLevel': r.get('DFreqLevel', ''),
-                'DComLevel': r.get('DComLevel', ''),
-                'EasinessScore': r.get('EasinessScore', ''),
-            })
-
-    fieldnames = [
-        'ID', 'English', 'French', 'MSA', 'POS',
-        'Category', 'CODA', 'Region',
-        'ASimLevel', 'FSimLevel', 'DFreqLevel', 'DComLevel',
-        'EasinessScore',
-    ]
+            by_id_to_cats.setdefault(r[id_i], set()).add(cat)
+            rows.append([r[i] for i in col_idx])
 
     # Write the full long-form file (all IDs, whatever categories they have)
     with output_all.open('w', newline='', encoding='utf-8') as f_out:
-        writer = csv.DictWriter(f_out, fieldnames=fieldnames)
-        writer.writeheader()
-        for r in rows:
-            writer.writerow(r)
+        writer = csv.writer(f_out)
+        writer.writerow(FIELDNAMES)
+        writer.writerows(rows)
 
     # Write the long-form filtered to IDs that have all three categories
     valid_ids = {cid for cid, cats in by_id_to_cats.items() if CATEGORIES.issubset(cats)}
 
     with output_triplet.open('w', newline='', encoding='utf-8') as f_out2:
-        writer = csv.DictWriter(f_out2, fieldnames=fieldnames)
-        writer.writeheader()
-        for r in rows:
-            if r['ID'] in valid_ids:
-                writer.writerow(r)
+        writer = csv.writer(f_out2)
+        writer.writerow(FIELDNAMES)
+        writer.writerows(r for r in rows if r[0] in valid_ids)
 
     print(f"Wrote: {output_all}")
     print(f"Wrote: {output_triplet} (IDs with all three categories)")